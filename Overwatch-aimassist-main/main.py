@@ -10,15 +10,15 @@ Enhanced aiming assistance system for Overwatch with:
 
 import cv2
 import numpy as np
-import mss
-import pyautogui
 import time
 import logging
 import os
 from src.core.config import Config
 from src.core.aim_state import AimState
-from src.core.target_detection import create_target_mask, extract_targets, select_best_target
-from src.control.aim_control import is_activated, calculate_target_velocity, predict_target_position, move_crosshair
+from src.core.screen_capture import FrameGrabber
+from src.core.target_detection import create_target_mask, extract_targets, select_best_target, roi_size
+from src.control.aim_control import is_activated, get_cursor_position, compute_move, move_mouse
+from src.control.key_input import KeyListener
 from src.utils.profile_manager import save_profile, load_profile, list_profiles
 from src.utils.results_manager import ResultsManager
 
@@ -47,155 +47,75 @@ def main_loop():
     if os.path.exists(os.path.join(Config.PROFILES_DIR, Config.DEFAULT_PROFILE)):
         load_profile(Config.DEFAULT_PROFILE)
     
-    frame_time = 1.0 / Config.FPS_LIMIT
-    last_frame_time = time.time()
+    frame_ns = 1_000_000_000 // Config.FPS_LIMIT
+    last_frame_ns = time.perf_counter_ns()
+    last_screenshot_ns = 0
+    # Wall-clock time of perf_counter_ns() == 0, for log timestamps
+    wall_offset = time.time() - time.perf_counter_ns() * 1e-9
     
+    grabber = None
+    key_listener = None
+    window_open = False
     try:
-        with mss.mss() as sct:
-            monitor = {
-                "top": 0,
-                "left": 0,
-                "width": Config.DETECTION_SIZE,
-                "height": Config.DETECTION_SIZE
-            }
-            
-            while True:
-                try:
-                    # FPS limiting
-                    current_time = time.time()
-                    elapsed = current_time - last_frame_time
-                    if elapsed < frame_time:
-                        time.sleep(frame_time - elapsed)
-                    last_frame_time = time.time()
-                    
-                    # Center detection area around cursor
-                    mouse_x, mouse_y = pyautogui.position()
-                    monitor['left'] = max(0, mouse_x - Config.DETECTION_SIZE // 2)
-                    monitor['top'] = max(0, mouse_y - Config.DETECTION_SIZE // 2)
-                    
-                    # Screen capture
-                    frame = np.array(sct.grab(monitor))
-                    
-                    # Frame processing
-                    mask = create_target_mask(frame)
-                    targets = extract_targets(mask)
-                    
-                    # Log target detections
-                    if targets:
-                        for target in targets:
-                            cx, cy, area = target
-                            results_manager.log_target_detection({
-                                "timestamp": current_time,
-                                "position": {"x": cx, "y": cy},
-                                "area": area,
-                                "mouse_position": {"x": mouse_x, "y": mouse_y}
-                            })
-                    
-                    # Target selection
-                    current_target = (
-                        aim_state.current_target 
-                        if time.time() - aim_state.last_target_time < Config.TARGET_LOCK_TIME 
-                        else None
-                    )
-                    
-                    best_target = select_best_target(targets, aim_state.screen_center, current_target)
-                    
-                    # Crosshair update
-                    if best_target and is_activated():
-                        cx, cy, area = best_target
-                        
-                        # Update target velocity
-                        if aim_state.last_target_pos != (0, 0):
-                            aim_state.target_velocity = calculate_target_velocity(
-                                (cx, cy),
-                                aim_state.last_target_pos,
-                                current_time - aim_state.last_update_time
-                            )
-                        
-                        # Predict target position
-                        predicted_pos = predict_target_position(
-                            (cx, cy),
-                            aim_state.target_velocity,
-                            Config.PREDICTION_TIME
-                        )
-                        
-                        # Log prediction
-                        results_manager.log_prediction({
-                            "timestamp": current_time,
-                            "current_position": {"x": cx, "y": cy},
-                            "predicted_position": {"x": predicted_pos[0], "y": predicted_pos[1]},
-                            "velocity": {"x": aim_state.target_velocity[0], "y": aim_state.target_velocity[1]}
-                        })
-                        
-                        aim_state.last_target_pos = (cx, cy)
-                        aim_state.last_target_time = current_time
-                        aim_state.current_target = best_target
-                        
-                        x_offset = predicted_pos[0] - aim_state.screen_center[0]
-                        y_offset = (predicted_pos[1] - aim_state.screen_center[1]) + Config.VERTICAL_OFFSET
-                        
-                        # Log shot attempt
-                        results_manager.log_shot({
-                            "timestamp": current_time,
-                            "target_position": {"x": cx, "y": cy},
-                            "crosshair_offset": {"x": x_offset, "y": y_offset},
-                            "target_area": area
-                        })
-                        
-                        move_crosshair(x_offset, y_offset, area, aim_state)
-                        
-                        # Save screenshot of the shot
-                        _, buffer = cv2.imencode('.png', frame)
-                        results_manager.save_screenshot(
-                            buffer.tobytes(),
-                            {
-                                "timestamp": current_time,
-                                "target_position": {"x": cx, "y": cy},
-                                "crosshair_position": {"x": mouse_x, "y": mouse_y},
-                                "target_area": area
-                            }
-                        )
-                    
-                    # Debug visualization
-                    if Config.DEBUG_MODE:
-                        debug_img = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR)
-                        
-                        # Draw center
-                        cv2.circle(debug_img, aim_state.screen_center, 3, (0, 255, 0), -1)
-                        
-                        # Draw all targets
-                        for target in targets:
-                            cx, cy, _ = target
-                            cv2.circle(debug_img, (cx, cy), 3, (0, 0, 255), -1)
-                        
-                        # Draw selected target
-                        if best_target:
-                            bx, by, _ = best_target
-                            cv2.circle(debug_img, (bx, by), 5, (255, 0, 0), 2)
-                            cv2.putText(debug_img, "TARGET", (bx+10, by), 
-                                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
-                        
-                        cv2.imshow("Overwatch Aim Assist [DEBUG]", debug_img)
-                    
-                    # Key handling
-                    key = cv2.waitKey(1) & 0xFF
-                    if key == Config.EXIT_KEY:
-                        # Save final session summary
-                        summary = results_manager.get_session_summary()
-                        print("\nSession Summary:")
-                        for key, value in summary.items():
-                            print(f"{key}: {value}")
-                        break
-                    elif key == Config.TOGGLE_DEBUG_KEY:
-                        Config.DEBUG_MODE = not Config.DEBUG_MODE
-                        if not Config.DEBUG_MODE:
-                            cv2.destroyAllWindows()
-                        logging.info(f"Debug mode {'enabled' if Config.DEBUG_MODE else 'disabled'}")
-                    elif key == Config.SAVE_PROFILE_KEY:
+        key_listener = KeyListener(pause_keys=(Config.SAVE_PROFILE_KEY, Config.LOAD_PROFILE_KEY))
+        key_listener.start()
+        # Capture runs one frame ahead on its own thread; detection and the
+        # (microsecond) control step stay on this one, so AimState has one writer
+        grabber = FrameGrabber()
+        grabber.start()
+        mask_buf = np.empty((Config.DETECTION_SIZE, Config.DETECTION_SIZE), dtype=np.uint8)
+        debug_buf = None
+        monitor = {
+            "top": 0,
+            "left": 0,
+            "width": Config.DETECTION_SIZE,
+            "height": Config.DETECTION_SIZE
+        }
+        
+        while True:
+            try:
+                # FPS limiting; one clock reading per frame unless we had to sleep
+                now_ns = time.perf_counter_ns()
+                elapsed_ns = now_ns - last_frame_ns
+                if elapsed_ns < frame_ns:
+                    time.sleep((frame_ns - elapsed_ns) * 1e-9)
+                    now_ns = time.perf_counter_ns()
+                last_frame_ns = now_ns
+                current_time = wall_offset + now_ns * 1e-9
+                
+                # Key handling: console keys come from the listener thread; the
+                # OpenCV window only needs pumping while the debug view is open
+                key = key_listener.get_key()
+                if Config.DEBUG_MODE:
+                    window_key = cv2.waitKey(1) & 0xFF
+                    if window_key != 0xFF:
+                        key = ord(chr(window_key).upper())
+                if key == Config.EXIT_KEY:
+                    # Save final session summary
+                    summary = results_manager.get_session_summary()
+                    print("\nSession Summary:")
+                    for key, value in summary.items():
+                        print(f"{key}: {value}")
+                    break
+                elif key == Config.TOGGLE_DEBUG_KEY:
+                    Config.DEBUG_MODE = not Config.DEBUG_MODE
+                    if not Config.DEBUG_MODE and window_open:
+                        cv2.destroyAllWindows()
+                        window_open = False
+                    logging.info(f"Debug mode {'enabled' if Config.DEBUG_MODE else 'disabled'}")
+                elif key == Config.SAVE_PROFILE_KEY:
+                    key_listener.pause()
+                    try:
                         profile_name = input("Enter profile name to save: ")
-                        if save_profile(profile_name):
-                            print(f"Profile {profile_name} saved")
-                    elif key == Config.LOAD_PROFILE_KEY:
+                    finally:
+                        key_listener.resume()
+                    if save_profile(profile_name):
+                        print(f"Profile {profile_name} saved")
+                elif key == Config.LOAD_PROFILE_KEY:
+                    # Console presses already paused the listener; window presses did not.
+                    # Either way it is resumed on every path
+                    key_listener.pause()
+                    try:
                         profiles = list_profiles()
                         if profiles:
                             print("\nAvailable profiles:")
@@ -210,21 +130,198 @@ def main_loop():
                                 print("Invalid input")
                         else:
                             print("No profiles available")
+                    finally:
+                        key_listener.resume()
+                
+                # Idle frames: skip capture and detection unless their result is consumed
+                activated = is_activated()
+                if not activated and not Config.DEBUG_MODE:
+                    grabber.pause()
+                    continue
+                grabber.resume()
+                
+                # A loaded profile can change DETECTION_SIZE; grow the buffers to match
+                if Config.DETECTION_SIZE != monitor['width']:
+                    monitor['width'] = monitor['height'] = Config.DETECTION_SIZE
+                    if Config.DETECTION_SIZE > mask_buf.shape[0]:
+                        mask_buf = np.empty((Config.DETECTION_SIZE, Config.DETECTION_SIZE), dtype=np.uint8)
+                        debug_buf = None
+                
+                # Center detection area around cursor
+                mouse_x, mouse_y = get_cursor_position()
+                monitor['left'] = max(0, mouse_x - Config.DETECTION_SIZE // 2)
+                monitor['top'] = max(0, mouse_y - Config.DETECTION_SIZE // 2)
+                
+                # While a target is locked, only capture a window around it
+                locked = now_ns - aim_state.last_target_time_ns < Config.TARGET_LOCK_TIME * 1_000_000_000
+                if Config.ROI_ENABLED and locked and aim_state.current_target:
+                    lock_x, lock_y, lock_area = aim_state.current_target
+                    size = roi_size(lock_area)
+                    region_left = max(0, monitor['left'] + lock_x - size // 2)
+                    region_top = max(0, monitor['top'] + lock_y - size // 2)
+                else:
+                    size = Config.DETECTION_SIZE
+                    region_left, region_top = monitor['left'], monitor['top']
+                
+                # Latest frame from the capture thread, and the region it covers
+                grabber.set_region(region_left, region_top, size, size)
+                frame, capture_left, capture_top = grabber.read()
+                if frame is None:
+                    continue
+                
+                # Optionally detect on a shrunk copy; the frame itself stays full size
+                scale = Config.DETECTION_DOWNSCALE
+                detect_frame = frame
+                if scale > 1:
+                    detect_frame = cv2.resize(frame, (frame.shape[1] // scale, frame.shape[0] // scale),
+                                              interpolation=cv2.INTER_AREA)
+                
+                # Frame processing into a view of the full-size mask buffer
+                mask_h, mask_w = detect_frame.shape[:2]
+                mask = create_target_mask(detect_frame, dst=mask_buf[:mask_h, :mask_w])
+                targets = extract_targets(mask, scale)
+                
+                # Express targets relative to the full detection area
+                offset_x = capture_left - monitor['left']
+                offset_y = capture_top - monitor['top']
+                if offset_x or offset_y:
+                    targets = [(cx + offset_x, cy + offset_y, area) for cx, cy, area in targets]
+                
+                # Log target detections
+                if targets:
+                    for target in targets:
+                        cx, cy, area = target
+                        results_manager.log_target_detection({
+                            "timestamp": current_time,
+                            "position": {"x": cx, "y": cy},
+                            "area": area,
+                            "mouse_position": {"x": mouse_x, "y": mouse_y}
+                        })
+                
+                # Target selection
+                current_target = (
+                    aim_state.current_target 
+                    if locked
+                    else None
+                )
                 
-                except Exception as e:
-                    logging.error(f"Error in main loop: {str(e)}")
-                    # Log difficulty
-                    results_manager.log_difficulty({
-                        "timestamp": time.time(),
-                        "error": str(e),
-                        "error_type": type(e).__name__
+                best_target = select_best_target(targets, aim_state.screen_center, current_target)
+                
+                # Crosshair update
+                if best_target and activated:
+                    cx, cy, area = best_target
+                    
+                    # Velocity, prediction, offset and smoothing in one compiled call
+                    (pred_x, pred_y, vx, vy,
+                     x_offset, y_offset, move_x, move_y) = compute_move(
+                        cx, cy,
+                        aim_state.last_target_pos[0], aim_state.last_target_pos[1],
+                        (now_ns - aim_state.last_update_time_ns) * 1e-9,
+                        aim_state.target_velocity[0], aim_state.target_velocity[1],
+                        area,
+                        aim_state.screen_center[0],
+                        aim_state.screen_center[1],
+                        Config.VERTICAL_OFFSET,
+                        Config.PREDICTION_TIME if Config.PREDICTION_ENABLED else 0.0,
+                        Config.MAX_PREDICTION_DISTANCE,
+                        Config.BASE_SMOOTHING,
+                        Config.SIZE_SMOOTHING_FACTOR,
+                        Config.DISTANCE_SMOOTHING_FACTOR,
+                        Config.VELOCITY_SMOOTHING_FACTOR,
+                        Config.INV_MAX_TARGET_AREA,
+                        Config.INV_DETECTION_SIZE
+                    )
+                    aim_state.target_velocity = (vx, vy)
+                    
+                    # Log prediction
+                    results_manager.log_prediction({
+                        "timestamp": current_time,
+                        "current_position": {"x": cx, "y": cy},
+                        "predicted_position": {"x": pred_x, "y": pred_y},
+                        "velocity": {"x": vx, "y": vy}
                     })
+                    
+                    aim_state.last_target_pos = (cx, cy)
+                    aim_state.last_target_time_ns = now_ns
+                    aim_state.last_update_time_ns = now_ns
+                    aim_state.current_target = best_target
+                    
+                    # Log shot attempt
+                    results_manager.log_shot({
+                        "timestamp": current_time,
+                        "target_position": {"x": cx, "y": cy},
+                        "crosshair_offset": {"x": x_offset, "y": y_offset},
+                        "target_area": area
+                    })
+                    
+                    move_mouse(move_x, move_y, aim_state)
+                    
+                    # Save screenshot of the shot, rate limited and encoded off-thread
+                    if now_ns - last_screenshot_ns >= Config.SCREENSHOT_INTERVAL * 1_000_000_000:
+                        last_screenshot_ns = now_ns
+                        results_manager.queue_screenshot(
+                            frame,
+                            {
+                                "timestamp": current_time,
+                                "target_position": {"x": cx, "y": cy},
+                                "crosshair_position": {"x": mouse_x, "y": mouse_y},
+                                "target_area": area
+                            }
+                        )
+                
+                # Debug visualization; nothing below runs, and no HighGUI call is
+                # made, unless debug mode is on
+                if not Config.DEBUG_MODE:
                     continue
                 
+                if debug_buf is None:
+                    debug_buf = np.empty(mask_buf.shape + (3,), dtype=np.uint8)
+                frame_h, frame_w = frame.shape[:2]
+                if scale > 1:
+                    mask = cv2.resize(mask, (frame_w, frame_h), interpolation=cv2.INTER_NEAREST)
+                debug_img = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR, dst=debug_buf[:frame_h, :frame_w])
+                
+                # Draw center (mask pixels are relative to the captured region)
+                cv2.circle(debug_img, (aim_state.screen_center[0] - offset_x,
+                                       aim_state.screen_center[1] - offset_y), 3, (0, 255, 0), -1)
+                
+                # Draw all targets
+                for target in targets:
+                    cx, cy, _ = target
+                    cv2.circle(debug_img, (cx - offset_x, cy - offset_y), 3, (0, 0, 255), -1)
+                
+                # Draw selected target
+                if best_target:
+                    bx, by = best_target[0] - offset_x, best_target[1] - offset_y
+                    cv2.circle(debug_img, (bx, by), 5, (255, 0, 0), 2)
+                    cv2.putText(debug_img, "TARGET", (bx+10, by), 
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+                
+                cv2.imshow("Overwatch Aim Assist [DEBUG]", debug_img)
+                window_open = True
+                
+            except Exception as e:
+                logging.error(f"Error in main loop: {str(e)}")
+                # Log difficulty
+                results_manager.log_difficulty({
+                    "timestamp": time.time(),
+                    "error": str(e),
+                    "error_type": type(e).__name__
+                })
+                continue
+            
     except Exception as e:
         logging.error(f"Critical error: {str(e)}")
     finally:
-        cv2.destroyAllWindows()
+        if grabber is not None:
+            grabber.stop()
+            grabber.join(timeout=1.0)
+            logging.info(f"Capture frames dropped as stale: {grabber.dropped}")
+        if key_listener is not None:
+            key_listener.stop()
+        results_manager.close()
+        if window_open:
+            cv2.destroyAllWindows()
         logging.info("Overwatch Aim Assist stopped")
 
 if __name__ == "__main__":
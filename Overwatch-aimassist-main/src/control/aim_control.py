@@ -9,25 +9,121 @@ This module handles the aim assistance functionality, including:
 
 import win32api
 import win32con
-import numpy as np
 from typing import Optional, Tuple
-from math import sqrt
+from math import hypot, tan, radians
 from src.core.config import Config
 from src.core.aim_state import AimState
+from src.utils.jit import njit
 from ..types import Target, Point, Vector
 
 def is_activated() -> bool:
     """Check if activation key is pressed"""
     return win32api.GetAsyncKeyState(Config.ACTIVATION_KEY) < 0
 
+def get_cursor_position() -> Tuple[int, int]:
+    """Current cursor position in screen coordinates"""
+    return win32api.GetCursorPos()
+
+# Kernels are compiled eagerly from their signatures when this module is imported, and
+# cache=True stores the machine code next to the sources, so later launches only load it
+@njit("UniTuple(f8, 2)(f8, f8, f8, f8, f8)", cache=True, fastmath=True)
+def _velocity_kernel(cx: float, cy: float, last_x: float, last_y: float, dt: float) -> Tuple[float, float]:
+    """Velocity between two positions, compiled to native code"""
+    # Sub-microsecond intervals are timer noise, not motion
+    if dt < 1e-6:
+        return 0.0, 0.0
+    return (cx - last_x) / dt, (cy - last_y) / dt
+
+@njit("UniTuple(i8, 2)(f8, f8, f8, f8, f8, f8)", cache=True, fastmath=True)
+def _predict_kernel(cx: float, cy: float, vx: float, vy: float,
+                    prediction_time: float, max_distance: float) -> Tuple[int, int]:
+    """Extrapolated position clamped to max_distance, compiled to native code"""
+    dx = vx * prediction_time
+    dy = vy * prediction_time
+    distance = hypot(dx, dy)
+    
+    # Limit maximum prediction distance
+    if distance > max_distance:
+        scale = max_distance / distance
+        dx *= scale
+        dy *= scale
+    
+    return int(cx + dx), int(cy + dy)
+
+# The clamps are written as selects so they compile to min/max instructions
+# rather than branches. Config values are passed in so the cache stays valid.
+@njit("f8(f8, f8, f8, f8, f8, f8, f8, f8, f8)", cache=True, fastmath=True)
+def _smoothing_kernel(target_size: float, distance: float, velocity: float,
+                      inv_max_area: float, inv_detection_size: float, base: float,
+                      size_factor_weight: float, distance_factor_weight: float,
+                      velocity_factor_weight: float) -> float:
+    """
+    Adaptive smoothing with all settings passed in, compiled to native code
+    
+    Normalizers are passed as reciprocals (Config.INV_*) so the kernel only multiplies.
+    """
+    size_factor = target_size * inv_max_area
+    size_factor = size_factor if size_factor < 1.0 else 1.0
+    distance_factor = distance * inv_detection_size
+    distance_factor = distance_factor if distance_factor < 1.0 else 1.0
+    velocity_factor = velocity * 0.001  # Velocity normalization
+    velocity_factor = velocity_factor if velocity_factor < 1.0 else 1.0
+    
+    smoothing = (base
+                 * (1 - size_factor_weight * size_factor)
+                 * (1 + distance_factor_weight * distance_factor)
+                 * (1 + velocity_factor_weight * velocity_factor))
+    
+    # Limit to reasonable range
+    smoothing = smoothing if smoothing < 1.0 else 1.0
+    return smoothing if smoothing > 0.1 else 0.1
+
+# Eager signature: arguments are cast to float64, so int and float callers share one compilation
+@njit("Tuple((i8, i8, f8, f8, i8, i8, f8, f8))(" + ", ".join(["f8"] * 19) + ")",
+      cache=True, fastmath=True)
+def compute_move(cx: float, cy: float, last_x: float, last_y: float, dt: float,
+                 vx: float, vy: float, target_area: float,
+                 center_x: float, center_y: float, vertical_offset: float,
+                 prediction_time: float, max_distance: float,
+                 base: float, size_factor_weight: float, distance_factor_weight: float,
+                 velocity_factor_weight: float, inv_max_area: float, inv_detection_size: float):
+    """
+    Fused per-frame aim math: velocity update, prediction, offset and smoothing
+    
+    Velocity is only re-estimated when a previous position exists
+    (last_x, last_y != 0, 0); pass prediction_time <= 0 to disable prediction.
+    
+    Returns:
+        (pred_x, pred_y, vx, vy, x_offset, y_offset, move_x, move_y) where
+        the position and offsets are whole pixels and move_x/move_y is the
+        smoothed, unrounded mouse delta
+    """
+    if last_x != 0 or last_y != 0:
+        vx, vy = _velocity_kernel(cx, cy, last_x, last_y, dt)
+    
+    if prediction_time > 0 and (vx != 0.0 or vy != 0.0):
+        pred_x, pred_y = _predict_kernel(cx, cy, vx, vy, prediction_time, max_distance)
+    else:
+        pred_x, pred_y = int(cx), int(cy)
+    
+    x_offset = pred_x - int(center_x)
+    y_offset = pred_y - int(center_y) + int(vertical_offset)
+    
+    distance = hypot(x_offset, y_offset)
+    velocity = hypot(vx, vy)
+    smoothing = _smoothing_kernel(target_area, distance, velocity, inv_max_area, inv_detection_size,
+                                  base, size_factor_weight, distance_factor_weight,
+                                  velocity_factor_weight)
+    
+    return (pred_x, pred_y, vx, vy, x_offset, y_offset,
+            x_offset * smoothing, y_offset * smoothing)
+
 def calculate_target_velocity(current_pos: Tuple[int, int], 
                             last_pos: Tuple[int, int],
                             dt: float) -> Tuple[float, float]:
     """Calculate target movement velocity"""
-    if dt <= 0:
-        return (0, 0)
-    return ((current_pos[0] - last_pos[0]) / dt,
-            (current_pos[1] - last_pos[1]) / dt)
+    return _velocity_kernel(float(current_pos[0]), float(current_pos[1]),
+                            float(last_pos[0]), float(last_pos[1]), float(dt))
 
 def predict_target_position(current_pos: Tuple[int, int],
                           velocity: Tuple[float, float],
@@ -35,21 +131,14 @@ def predict_target_position(current_pos: Tuple[int, int],
     """Predict future target position"""
     if not Config.PREDICTION_ENABLED or prediction_time <= 0:
         return current_pos
-        
-    predicted_x = current_pos[0] + velocity[0] * prediction_time
-    predicted_y = current_pos[1] + velocity[1] * prediction_time
-    
-    # Limit maximum prediction distance
-    dx = predicted_x - current_pos[0]
-    dy = predicted_y - current_pos[1]
-    distance = sqrt(dx*dx + dy*dy)
     
-    if distance > Config.MAX_PREDICTION_DISTANCE:
-        scale = Config.MAX_PREDICTION_DISTANCE / distance
-        predicted_x = current_pos[0] + dx * scale
-        predicted_y = current_pos[1] + dy * scale
+    # Stationary target (or first frame): nothing to extrapolate
+    if velocity[0] == 0.0 and velocity[1] == 0.0:
+        return current_pos
     
-    return (int(predicted_x), int(predicted_y))
+    return _predict_kernel(float(current_pos[0]), float(current_pos[1]),
+                           float(velocity[0]), float(velocity[1]),
+                           float(prediction_time), float(Config.MAX_PREDICTION_DISTANCE))
 
 def adaptive_smoothing(target_size: float, 
                       distance: float,
@@ -60,16 +149,11 @@ def adaptive_smoothing(target_size: float,
     - Distance to target
     - Target movement velocity
     """
-    size_factor = min(target_size / Config.MAX_TARGET_AREA, 1.0)
-    distance_factor = min(distance / Config.DETECTION_SIZE, 1.0)
-    velocity_factor = min(velocity / 1000, 1.0)  # Velocity normalization
-    
-    smoothing = Config.BASE_SMOOTHING
-    smoothing *= (1 - Config.SIZE_SMOOTHING_FACTOR * size_factor)
-    smoothing *= (1 + Config.DISTANCE_SMOOTHING_FACTOR * distance_factor)
-    smoothing *= (1 + Config.VELOCITY_SMOOTHING_FACTOR * velocity_factor)
-    
-    return max(0.1, min(1.0, smoothing))  # Limit to reasonable range
+    return _smoothing_kernel(float(target_size), float(distance), float(velocity),
+                             Config.INV_MAX_TARGET_AREA, Config.INV_DETECTION_SIZE,
+                             float(Config.BASE_SMOOTHING), float(Config.SIZE_SMOOTHING_FACTOR),
+                             float(Config.DISTANCE_SMOOTHING_FACTOR),
+                             float(Config.VELOCITY_SMOOTHING_FACTOR))
 
 def move_crosshair(x_offset: int, y_offset: int, target_size: float, aim_state: AimState) -> None:
     """
@@ -81,17 +165,29 @@ def move_crosshair(x_offset: int, y_offset: int, target_size: float, aim_state:
         target_size: Target area for adaptive smoothing
         aim_state: Current aim state for velocity calculation
     """
-    distance = sqrt(x_offset*x_offset + y_offset*y_offset)
-    velocity = sqrt(aim_state.target_velocity[0]**2 + aim_state.target_velocity[1]**2)
+    vx, vy = aim_state.target_velocity
+    distance = hypot(x_offset, y_offset)
+    velocity = hypot(vx, vy)
     
     smoothing = adaptive_smoothing(target_size, distance, velocity)
     
-    win32api.mouse_event(
-        win32con.MOUSEEVENTF_MOVE,
-        int(x_offset * smoothing),
-        int(y_offset * smoothing),
-        0, 0
-    )
+    move_mouse(x_offset * smoothing, y_offset * smoothing, aim_state)
+
+def move_mouse(dx: float, dy: float, aim_state: AimState) -> None:
+    """
+    Move cursor by a relative delta
+    
+    The sub-pixel remainder is carried in aim_state to the next call instead
+    of being truncated away, and no event is sent for a zero-pixel move.
+    """
+    dx += aim_state.residual_x
+    dy += aim_state.residual_y
+    move_x, move_y = int(dx), int(dy)
+    aim_state.residual_x = dx - move_x
+    aim_state.residual_y = dy - move_y
+    
+    if move_x or move_y:
+        win32api.mouse_event(win32con.MOUSEEVENTF_MOVE, move_x, move_y, 0, 0)
 
 class AimController:
     """Handles aim assistance functionality.
@@ -113,6 +209,7 @@ class AimController:
         self.prediction_time = config['aim_assistance']['prediction_time']
         self.max_angle_correction = config['aim_assistance']['max_angle_correction']
         self.enable_prediction = config['aim_assistance']['enable_prediction']
+        self.max_correction = tan(radians(self.max_angle_correction))
         
         # Initialize aim state
         self.aim_state: AimState = {
@@ -137,7 +234,7 @@ class AimController:
         dy = target_pos[1] - current_pos[1]
         
         # Calculate distance
-        distance = np.sqrt(dx**2 + dy**2)
+        distance = hypot(dx, dy)
         
         # Normalize vector
         if distance > 0:
@@ -159,7 +256,7 @@ class AimController:
         current_vx, current_vy = self.aim_state['current_velocity']
         
         # Calculate vector magnitude
-        magnitude = sqrt(vector[0]**2 + vector[1]**2)
+        magnitude = hypot(vector[0], vector[1])
         
         # Dynamic smoothing based on movement speed
         if magnitude > 0.5:  # Fast movement
@@ -199,7 +296,7 @@ class AimController:
             acc_y = (vel_y - self.last_velocity[1]) / self.prediction_time
             
             # Dampen acceleration for sudden changes
-            acc_magnitude = sqrt(acc_x*acc_x + acc_y*acc_y)
+            acc_magnitude = hypot(acc_x, acc_y)
             if acc_magnitude > 1000:  # Threshold for sudden acceleration
                 dampening = 1000 / acc_magnitude
                 acc_x *= dampening
@@ -217,7 +314,7 @@ class AimController:
         # Limit prediction distance with smooth falloff
         dx = pred_x - pos_x
         dy = pred_y - pos_y
-        distance = sqrt(dx*dx + dy*dy)
+        distance = hypot(dx, dy)
         if distance > Config.MAX_PREDICTION_DISTANCE:
             # Smooth falloff instead of hard cutoff
             falloff = (Config.MAX_PREDICTION_DISTANCE / distance) ** 2
@@ -256,11 +353,10 @@ class AimController:
         smoothed_vector = self.apply_smoothing(aim_vector)
         
         # Apply angle correction limit
-        magnitude = np.sqrt(smoothed_vector[0]**2 + smoothed_vector[1]**2)
+        magnitude = hypot(smoothed_vector[0], smoothed_vector[1])
         if magnitude > 0:
-            max_correction = np.tan(np.radians(self.max_angle_correction))
-            if magnitude > max_correction:
-                scale = max_correction / magnitude
+            if magnitude > self.max_correction:
+                scale = self.max_correction / magnitude
                 smoothed_vector = (smoothed_vector[0] * scale, smoothed_vector[1] * scale)
         
         return smoothed_vector
@@ -0,0 +1,66 @@
+"""
+Console keyboard input for Overwatch Aim Assist
+
+Keys are read on a background thread so the main loop never has to block in
+cv2.waitKey() just to poll the keyboard.
+"""
+
+import time
+import queue
+import threading
+import msvcrt
+
+class KeyListener(threading.Thread):
+    """
+    Polls the console for key presses and queues their codes
+
+    Codes are upper-cased so they compare equal to the Config.*_KEY values.
+    Reading a key in pause_keys pauses the listener before the key is queued,
+    so the console input that follows it (e.g. an input() prompt) is never
+    consumed here; the main loop resumes it when done.
+    """
+
+    def __init__(self, poll_interval: float = 0.01, pause_keys: tuple = ()):
+        super().__init__(name="KeyListener", daemon=True)
+        self._keys = queue.Queue()
+        self._poll_interval = poll_interval
+        self._pause_keys = frozenset(pause_keys)
+        self._active = threading.Event()
+        self._active.set()
+        self._stopped = False
+
+    def get_key(self) -> int:
+        """Next queued key code, or -1 if none is pending"""
+        try:
+            return self._keys.get_nowait()
+        except queue.Empty:
+            return -1
+
+    def pause(self) -> None:
+        """Stop reading the console, e.g. while input() is prompting"""
+        self._active.clear()
+
+    def resume(self) -> None:
+        """Continue reading the console"""
+        self._active.set()
+
+    def stop(self) -> None:
+        """Stop the listener thread"""
+        self._stopped = True
+        self._active.set()
+
+    def run(self) -> None:
+        while not self._stopped:
+            self._active.wait()
+            if msvcrt.kbhit():
+                ch = msvcrt.getwch()
+                if ch in ('\x00', '\xe0'):
+                    # Prefix of a function/arrow key; discard its scan code
+                    msvcrt.getwch()
+                    continue
+                code = ord(ch.upper())
+                if code in self._pause_keys:
+                    self._active.clear()
+                self._keys.put(code)
+            else:
+                time.sleep(self._poll_interval)
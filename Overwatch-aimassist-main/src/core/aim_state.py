@@ -3,19 +3,25 @@ Aim state tracking for Overwatch Aim Assist
 """
 
 import time
+import numpy as np
 from typing import Tuple, Optional
 from src.core.config import Config
 
 class AimState:
     """Tracks aiming state between frames"""
     
+    # Fixed attribute set: no per-instance __dict__, and faster attribute access
+    __slots__ = (
+        'current_target', 'last_target_time_ns', 'last_target_pos', 'target_velocity',
+        'screen_center', 'last_update_time_ns', 'residual_x', 'residual_y'
+    )
+    
     def __init__(self):
         self.current_target: Optional[Tuple[int, int, float]] = None
-        self.last_target_time: float = 0
+        self.last_target_time_ns: int = 0    # time.perf_counter_ns() of last lock
         self.last_target_pos: Tuple[int, int] = (0, 0)
         self.target_velocity: Tuple[float, float] = (0, 0)
-        self.screen_center: Tuple[int, int] = (
-            Config.DETECTION_SIZE // 2, 
-            Config.DETECTION_SIZE // 2
-        )
-        self.last_update_time: float = time.time() 
\ No newline at end of file
+        self.screen_center: np.ndarray = np.array(Config.SCREEN_CENTER, dtype=np.int32)
+        self.last_update_time_ns: int = time.perf_counter_ns()
+        self.residual_x: float = 0.0  # Sub-pixel mouse movement not yet sent
+        self.residual_y: float = 0.0 
\ No newline at end of file
@@ -6,6 +6,20 @@ import win32con
 import numpy as np
 from typing import Dict, Any
 
+def hsv_range_lut(*ranges) -> np.ndarray:
+    """
+    Per-channel lookup table for a union of HSV ranges
+    
+    Row c, entry v has bit k set when value v of channel c lies within the
+    k-th (lower, upper) range, so a pixel matches range k when bit k is set
+    in all three of its channel entries.
+    """
+    lut = np.zeros((3, 256), dtype=np.uint8)
+    for bit, (lower, upper) in enumerate(ranges):
+        for channel in range(3):
+            lut[channel, int(lower[channel]):int(upper[channel]) + 1] |= 1 << bit
+    return lut
+
 class Config:
     """All configurable parameters of the system"""
     
@@ -32,10 +46,24 @@ class Config:
     # Performance settings
     FPS_LIMIT: int = 60                    # FPS limit
     DEBUG_MODE: bool = True                # Debug mode by default
+    USE_OPENCL: bool = True                # Run vision effects on OpenCL when available
+    DETECTION_DOWNSCALE: int = 1           # Detect on frames shrunk by this factor (1 = full size)
+    
+    # Screen capture
+    USE_DXCAM: bool = True                 # Prefer DXcam over MSS on Windows
+    CAPTURE_RESTART_THRESHOLD: int = 16    # Region drift (px) before DXcam restarts
+    
+    # Tracking region: while a target is locked only a window around it is captured
+    ROI_ENABLED: bool = True
+    ROI_MIN_SIZE: int = 64                 # Smallest window side (px)
+    ROI_SIZE_STEP: int = 32                # Window side is rounded up to this (px)
     
     # Crosshair offset
     VERTICAL_OFFSET: int = 30            # Positive = below center
     
+    # Results logging
+    SCREENSHOT_INTERVAL: float = 0.25    # Minimum time between shot screenshots (sec)
+    
     # Target parameters
     MIN_TARGET_SIZE: int = 50            # Minimum contour area
     MAX_TARGET_AREA: int = 2000          # For size normalization
@@ -46,17 +74,35 @@ class Config:
     PREDICTION_TIME: float = 0.08        # Reduced for more immediate response
     MAX_PREDICTION_DISTANCE: int = 120   # Balanced prediction distance
     
-    # Color ranges (HSV)
-    LOWER_RED1: np.ndarray = np.array([0, 150, 150])
-    UPPER_RED1: np.ndarray = np.array([10, 255, 255])
-    LOWER_RED2: np.ndarray = np.array([160, 150, 150])
-    UPPER_RED2: np.ndarray = np.array([180, 255, 255])
+    # Color ranges (HSV), stored as uint8 to match the HSV frame for cv2.inRange
+    LOWER_RED1: np.ndarray = np.array([0, 150, 150], dtype=np.uint8)
+    UPPER_RED1: np.ndarray = np.array([10, 255, 255], dtype=np.uint8)
+    LOWER_RED2: np.ndarray = np.array([160, 150, 150], dtype=np.uint8)
+    UPPER_RED2: np.ndarray = np.array([180, 255, 255], dtype=np.uint8)
     
     # Target selection weights
     CENTER_WEIGHT: float = 0.4           # Center screen priority
     SIZE_WEIGHT: float = 0.3             # Target size priority
     CURRENT_TARGET_WEIGHT: float = 0.3   # Current target priority
     
+    # Derived values, kept in sync by update_derived()
+    INV_MAX_TARGET_AREA: float = 1.0 / MAX_TARGET_AREA
+    INV_DETECTION_SIZE: float = 1.0 / DETECTION_SIZE
+    RED_RANGE_LUT: np.ndarray = hsv_range_lut((LOWER_RED1, UPPER_RED1), (LOWER_RED2, UPPER_RED2))
+    SCREEN_CENTER: tuple = (DETECTION_SIZE // 2, DETECTION_SIZE // 2)
+    SCORE_WEIGHTS: np.ndarray = np.array([CENTER_WEIGHT, SIZE_WEIGHT, CURRENT_TARGET_WEIGHT], dtype=np.float64)
+    
+    @classmethod
+    def update_derived(cls) -> None:
+        """Recompute values derived from other settings"""
+        cls.INV_MAX_TARGET_AREA = 1.0 / cls.MAX_TARGET_AREA
+        cls.INV_DETECTION_SIZE = 1.0 / cls.DETECTION_SIZE
+        cls.RED_RANGE_LUT = hsv_range_lut((cls.LOWER_RED1, cls.UPPER_RED1),
+                                          (cls.LOWER_RED2, cls.UPPER_RED2))
+        cls.SCREEN_CENTER = (cls.DETECTION_SIZE // 2, cls.DETECTION_SIZE // 2)
+        cls.SCORE_WEIGHTS = np.array([cls.CENTER_WEIGHT, cls.SIZE_WEIGHT, cls.CURRENT_TARGET_WEIGHT],
+                                     dtype=np.float64)
+    
     @classmethod
     def to_dict(cls) -> Dict[str, Any]:
         """Convert settings to dictionary for saving"""
@@ -89,6 +135,7 @@ class Config:
         for key, value in data.items():
             if hasattr(cls, key):
                 if isinstance(value, list) and key.startswith(('LOWER_', 'UPPER_')):
-                    setattr(cls, key, np.array(value))
+                    setattr(cls, key, np.array(value, dtype=np.uint8))
                 else:
-                    setattr(cls, key, value) 
\ No newline at end of file
+                    setattr(cls, key, value)
+        cls.update_derived() 
\ No newline at end of file
@@ -0,0 +1,178 @@
+"""
+Screen capture backends for Overwatch Aim Assist
+
+DXcam (Desktop Duplication API) is used on Windows when it is installed;
+MSS (GDI BitBlt) is the portable fallback.
+"""
+
+import sys
+import time
+import logging
+import threading
+import numpy as np
+import mss
+from typing import Optional, Tuple
+from src.core.config import Config
+
+try:
+    import dxcam
+except ImportError:
+    dxcam = None
+
+class MSSCapture:
+    """Screen capture through MSS, returns BGRA frames"""
+
+    def __init__(self):
+        self._sct = mss.mss()
+        self.left = 0
+        self.top = 0
+
+    def grab(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        """Capture region, viewing MSS's BGRA buffer in place"""
+        shot = self._sct.grab({"left": left, "top": top, "width": width, "height": height})
+        self.left, self.top = left, top
+        return np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+
+    def close(self) -> None:
+        self._sct.close()
+
+class DXCamCapture:
+    """Screen capture through DXcam's Desktop Duplication stream, returns BGR frames"""
+
+    def __init__(self):
+        self._camera = dxcam.create(output_color="BGR")
+        if self._camera is None:
+            raise RuntimeError("DXcam could not open an output")
+        self._region = None
+        self.left = 0
+        self.top = 0
+
+    def grab(self, left: int, top: int, width: int, height: int) -> np.ndarray:
+        """Capture region from the running stream
+
+        The stream is only restarted when the requested region moves by more
+        than Config.CAPTURE_RESTART_THRESHOLD pixels; `left`/`top` always
+        report the region the returned frame actually covers.
+        """
+        left = min(max(0, left), self._camera.width - width)
+        top = min(max(0, top), self._camera.height - height)
+
+        if (self._region is None
+                or self._region[2] - self._region[0] != width
+                or self._region[3] - self._region[1] != height
+                or abs(left - self._region[0]) > Config.CAPTURE_RESTART_THRESHOLD
+                or abs(top - self._region[1]) > Config.CAPTURE_RESTART_THRESHOLD):
+            if self._region is not None:
+                self._camera.stop()
+            self._region = (left, top, left + width, top + height)
+            self._camera.start(region=self._region, target_fps=Config.FPS_LIMIT, video_mode=True)
+
+        self.left, self.top = self._region[0], self._region[1]
+        return self._camera.get_latest_frame()
+
+    def close(self) -> None:
+        if self._region is not None:
+            self._camera.stop()
+        self._camera.release()
+
+def create_capture():
+    """Create the fastest capture backend available on this system"""
+    if Config.USE_DXCAM and dxcam is not None and sys.platform == "win32":
+        try:
+            capture = DXCamCapture()
+            logging.info("Using DXcam capture backend")
+            return capture
+        except Exception as e:
+            logging.warning(f"DXcam unavailable, falling back to MSS: {str(e)}")
+    logging.info("Using MSS capture backend")
+    return MSSCapture()
+
+class FrameGrabber(threading.Thread):
+    """
+    Captures frames on a background thread so capture overlaps detection
+    
+    Only the most recent frame is kept: the producer publishes each new frame
+    by swapping a reference under a lock, and read() hands out the latest one.
+    A frame replaced before it was read is dropped and counted in `dropped`,
+    so a slow consumer always works on the newest frame instead of a backlog.
+    """
+    
+    def __init__(self):
+        super().__init__(name="FrameGrabber", daemon=True)
+        self._lock = threading.Lock()
+        self._new_frame = threading.Event()
+        self._active = threading.Event()
+        self._stopped = False
+        self._region = (0, 0, Config.DETECTION_SIZE, Config.DETECTION_SIZE)
+        self._frame = None
+        self._origin = (0, 0)
+        self.dropped = 0  # Frames replaced before they were read
+    
+    def set_region(self, left: int, top: int, width: int, height: int) -> None:
+        """Set the screen region for subsequent captures"""
+        with self._lock:
+            self._region = (left, top, width, height)
+    
+    def resume(self) -> None:
+        """Start or continue capturing"""
+        self._active.set()
+    
+    def pause(self) -> None:
+        """Stop capturing until resumed; the last frame is discarded"""
+        self._active.clear()
+        with self._lock:
+            self._frame = None
+            self._new_frame.clear()
+    
+    def stop(self) -> None:
+        """Stop the capture thread"""
+        self._stopped = True
+        self._active.set()
+    
+    def read(self, timeout: float = 0.5) -> Tuple[Optional[np.ndarray], int, int]:
+        """
+        Wait for a frame newer than the previous read
+        
+        Returns:
+            (frame, left, top) with the screen origin the frame covers,
+            or (None, 0, 0) on timeout
+        """
+        if not self._new_frame.wait(timeout):
+            return None, 0, 0
+        with self._lock:
+            self._new_frame.clear()
+            if self._frame is None:
+                return None, 0, 0
+            return self._frame, self._origin[0], self._origin[1]
+    
+    def run(self) -> None:
+        # Capture backends hold per-thread handles, so create ours here
+        capture = create_capture()
+        frame_time = 1.0 / Config.FPS_LIMIT
+        frame_time_ns = 1_000_000_000 // Config.FPS_LIMIT
+        try:
+            while not self._stopped:
+                self._active.wait()
+                if self._stopped:
+                    break
+                start_ns = time.perf_counter_ns()
+                with self._lock:
+                    region = self._region
+                try:
+                    frame = capture.grab(*region)
+                except Exception as e:
+                    logging.error(f"Screen capture failed: {str(e)}")
+                    time.sleep(frame_time)
+                    continue
+                if frame is not None and self._active.is_set():
+                    with self._lock:
+                        if self._new_frame.is_set():
+                            self.dropped += 1
+                        self._frame = frame
+                        self._origin = (capture.left, capture.top)
+                        self._new_frame.set()
+                elapsed_ns = time.perf_counter_ns() - start_ns
+                if elapsed_ns < frame_time_ns:
+                    time.sleep((frame_time_ns - elapsed_ns) * 1e-9)
+        finally:
+            capture.close()
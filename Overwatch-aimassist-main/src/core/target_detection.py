@@ -7,41 +7,104 @@ It uses computer vision techniques to identify potential targets and track their
 import cv2
 import numpy as np
 from typing import List, Optional, Tuple
-from math import sqrt
+from math import sqrt, hypot
 from src.core.config import Config
+from src.utils.jit import njit, NUMBA_AVAILABLE
 from ..types import Target, Frame, Point, Vector
 
 def calculate_distance(p1: Tuple[int, int], p2: Tuple[int, int]) -> float:
     """Calculate Euclidean distance between two points"""
     return sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
 
-def create_target_mask(frame: np.ndarray) -> np.ndarray:
-    """Create mask of potential targets by color"""
-    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
-    mask1 = cv2.inRange(hsv, Config.LOWER_RED1, Config.UPPER_RED1)
-    mask2 = cv2.inRange(hsv, Config.LOWER_RED2, Config.UPPER_RED2)
-    return cv2.bitwise_or(mask1, mask2)
+# Scratch buffers reused across frames, one per name, grown to the largest frame seen
+_buffers = {}
 
-def extract_targets(mask: np.ndarray) -> List[Tuple[int, int, float]]:
-    """Extract centers and areas of all valid targets"""
-    # Find contours with hierarchy to handle nested contours
-    contours, hierarchy = cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-    targets = []
+def _scratch(name: str, shape: Tuple[int, ...]) -> np.ndarray:
+    """Return a reusable uint8 buffer view of the given (height, width, ...) shape"""
+    h, w = shape[:2]
+    buf = _buffers.get(name)
+    if buf is None or buf.shape[0] < h or buf.shape[1] < w:
+        if buf is not None:
+            h, w = max(h, buf.shape[0]), max(w, buf.shape[1])
+        buf = _buffers[name] = np.empty((h, w) + shape[2:], dtype=np.uint8)
+    return buf[:shape[0], :shape[1]]
+
+def roi_size(area: float) -> int:
+    """
+    Side of the square capture region used while a target of the given area is locked
+    
+    Four times the target's equivalent square side, at least Config.ROI_MIN_SIZE and
+    at most Config.DETECTION_SIZE, rounded up to Config.ROI_SIZE_STEP so small size
+    changes don't resize the capture.
+    """
+    size = max(Config.ROI_MIN_SIZE, 4 * int(sqrt(area)))
+    size = -(-size // Config.ROI_SIZE_STEP) * Config.ROI_SIZE_STEP
+    return min(Config.DETECTION_SIZE, size)
+
+@njit("void(u1[:, :, :], u1[:, ::1], u1[:, :])", cache=True)
+def _range_mask_kernel(hsv: np.ndarray, lut: np.ndarray, out: np.ndarray) -> None:
+    """Set out to 255 where an HSV pixel matches any range of a hsv_range_lut table, else 0"""
+    for y in range(hsv.shape[0]):
+        for x in range(hsv.shape[1]):
+            bits = lut[0, hsv[y, x, 0]] & lut[1, hsv[y, x, 1]] & lut[2, hsv[y, x, 2]]
+            out[y, x] = 255 if bits else 0
+
+def create_target_mask(frame: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """Create mask of potential targets by color
+    
+    Accepts BGR or BGRA frames; the HSV conversion reads 4-channel input
+    directly, so the alpha channel is never repacked. Pass a preallocated
+    uint8 array (or view) of the frame's height and width as `dst` to reuse
+    it for the result; a `dst` of any other shape is ignored and a new array
+    is returned, as cv2 would.
+    """
+    shape = frame.shape[:2]
+    # The kernel writes out[y, x] for every frame pixel without bounds checks
+    if dst is None or dst.shape != shape:
+        dst = np.empty(shape, dtype=np.uint8)
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=_scratch("hsv", shape + (3,)))
+    
+    # With Numba both red ranges are tested in one pass through Config.RED_RANGE_LUT
+    if NUMBA_AVAILABLE:
+        _range_mask_kernel(hsv, Config.RED_RANGE_LUT, dst)
+        return dst
     
-    for cnt in contours:
-        area = cv2.contourArea(cnt)
-        if area > Config.MIN_TARGET_SIZE:
-            M = cv2.moments(cnt)
-            if M["m00"] != 0:
-                cx = int(M["m10"] / M["m00"])
-                cy = int(M["m01"] / M["m00"])
-                # Check if point is within detection area
-                if 0 <= cx < Config.DETECTION_SIZE and 0 <= cy < Config.DETECTION_SIZE:
-                    targets.append((cx, cy, area))
+    # The first range goes straight into the result, which the second is OR-ed into in place
+    cv2.inRange(hsv, Config.LOWER_RED1, Config.UPPER_RED1, dst=dst)
+    mask2 = cv2.inRange(hsv, Config.LOWER_RED2, Config.UPPER_RED2, dst=_scratch("mask2", shape))
+    return cv2.bitwise_or(dst, mask2, dst=dst)
+
+def extract_targets(mask: np.ndarray, scale: int = 1) -> List[Tuple[int, int, float]]:
+    """Extract centers and areas of all valid targets
+    
+    For a mask built from a frame shrunk by `scale`, centers and areas are
+    scaled back to full-size frame coordinates.
+    """
+    # Only outer contours: holes inside a target are not targets themselves
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return []
+    
+    # Areas of all contours, then bounding boxes only for those large enough
+    areas = np.fromiter((cv2.contourArea(cnt) for cnt in contours), dtype=np.float64, count=len(contours))
+    if scale != 1:
+        areas *= scale * scale
+    keep = np.flatnonzero(areas > Config.MIN_TARGET_SIZE)
+    if not keep.size:
+        return []
+    areas = areas[keep]
+    rects = np.array([cv2.boundingRect(contours[i]) for i in keep], dtype=np.int32)
+    
+    # Target centers are bounding box centers, which match the centroid of the
+    # solid, near-convex blobs the color mask produces and skip computing moments
+    cx = (2 * rects[:, 0] + rects[:, 2]) * scale // 2
+    cy = (2 * rects[:, 1] + rects[:, 3]) * scale // 2
+    valid = (cx >= 0) & (cx < Config.DETECTION_SIZE) & (cy >= 0) & (cy < Config.DETECTION_SIZE)
+    cx, cy, areas = cx[valid], cy[valid], areas[valid]
     
     # Sort targets by area in descending order
-    targets.sort(key=lambda x: x[2], reverse=True)
-    return targets
+    order = np.argsort(-areas, kind="stable")
+    return list(zip(cx[order].tolist(), cy[order].tolist(), areas[order].tolist()))
 
 def calculate_target_score(target: Tuple[int, int, float],
                           center: Tuple[int, int],
@@ -74,6 +137,62 @@ def calculate_target_score(target: Tuple[int, int, float],
             size_score * Config.SIZE_WEIGHT +
             target_score * Config.CURRENT_TARGET_WEIGHT)
 
+@njit("i8(f8[:, ::1], f8, f8, f8, f8, f8, b1, f8[::1], f8)", cache=True, fastmath=True)
+def _best_target_index(targets: np.ndarray, center_x: float, center_y: float,
+                       last_x: float, last_y: float, last_area: float, has_current: bool,
+                       weights: np.ndarray, inv_max_area: float) -> int:
+    """
+    Index of the highest rated (cx, cy, area) row, rated as in calculate_target_score
+    
+    weights holds the center, size and current-target weights (Config.SCORE_WEIGHTS).
+    A row equal to the current target (last_x, last_y, last_area) is returned
+    as soon as it is found, so the current target is kept while visible.
+    """
+    center_weight = weights[0]
+    size_weight = weights[1]
+    current_weight = weights[2]
+    best = 0
+    best_score = -1.0  # Scores are never negative; no infinity under fastmath
+    for i in range(targets.shape[0]):
+        cx = targets[i, 0]
+        cy = targets[i, 1]
+        if has_current and cx == last_x and cy == last_y and targets[i, 2] == last_area:
+            return i
+        size_score = targets[i, 2] * inv_max_area
+        size_score = size_score if size_score < 1.0 else 1.0
+        
+        score = center_weight / (1 + hypot(cx - center_x, cy - center_y)) + size_weight * size_score
+        if has_current:
+            score += current_weight / (1 + hypot(cx - last_x, cy - last_y))
+        
+        if score > best_score:
+            best = i
+            best_score = score
+    return best
+
+def _best_target_index_numpy(targets: np.ndarray, center_x: float, center_y: float,
+                             last_x: float, last_y: float, last_area: float, has_current: bool,
+                             weights: np.ndarray, inv_max_area: float) -> int:
+    """Same choice as _best_target_index, as whole-column NumPy operations"""
+    if has_current:
+        matches = np.flatnonzero((targets == (last_x, last_y, last_area)).all(axis=1))
+        if matches.size:
+            return int(matches[0])
+    cx = targets[:, 0]
+    cy = targets[:, 1]
+    
+    # Center, size and current-target scores as columns, combined by one dot product
+    features = np.zeros_like(targets)
+    features[:, 0] = 1 / (1 + np.hypot(cx - center_x, cy - center_y))
+    features[:, 1] = np.minimum(targets[:, 2] * inv_max_area, 1.0)
+    if has_current:
+        features[:, 2] = 1 / (1 + np.hypot(cx - last_x, cy - last_y))
+    return int(np.argmax(features @ weights))
+
+# Without Numba the kernel would be an interpreted per-target loop
+if not NUMBA_AVAILABLE:
+    _best_target_index = _best_target_index_numpy
+
 def select_best_target(targets: List[Tuple[int, int, float]],
                       center: Tuple[int, int],
                       current_target: Optional[Tuple[int, int, float]]) -> Optional[Tuple[int, int, float]]:
@@ -81,18 +200,21 @@ def select_best_target(targets: List[Tuple[int, int, float]],
     if not targets:
         return None
     
-    # If current target is still visible, keep it
-    if current_target in targets:
-        return current_target
+    # A lone target wins without rating
+    if len(targets) == 1:
+        return targets[0]
     
-    # Calculate rating for all targets
-    scored_targets = [
-        (calculate_target_score(t, center, current_target), t)
-        for t in targets
-    ]
-    
-    # Select target with maximum rating
-    return max(scored_targets, key=lambda x: x[0])[1]
+    # Rate all targets in one compiled pass over a (N, 3) array of cx, cy, area rows;
+    # the same pass keeps the current target if it is still visible
+    if current_target:
+        last_cx, last_cy, last_area = current_target
+    else:
+        last_cx = last_cy = last_area = 0
+    best = _best_target_index(np.asarray(targets, dtype=np.float64),
+                              float(center[0]), float(center[1]),
+                              float(last_cx), float(last_cy), float(last_area), bool(current_target),
+                              Config.SCORE_WEIGHTS, Config.INV_MAX_TARGET_AREA)
+    return targets[best]
 
 class TargetDetector:
     """Handles target detection and tracking in the game screen.
@@ -245,23 +367,26 @@ class TargetDetector:
         Returns:
             Filtered list of targets
         """
-        filtered_targets: List[Target] = []
+        if not targets:
+            return []
         
-        for target in targets:
-            # Check distance from screen center
-            center_x, center_y = target['position']
-            distance = np.sqrt(center_x**2 + center_y**2)
-            
-            if distance > self.max_target_distance:
-                continue
-                
-            # Check if target is too close to others
-            if self._is_too_close(target, filtered_targets):
-                continue
-                
-            filtered_targets.append(target)
-            
-        return filtered_targets
+        positions = np.array([t['position'] for t in targets], dtype=np.int64)
+        
+        # Check distance from screen center, for all targets at once (squared, no sqrt)
+        dist_sq = np.einsum('ij,ij->i', positions, positions)
+        in_range = np.flatnonzero(dist_sq <= self.max_target_distance ** 2)
+        
+        # Pairwise squared distances between the remaining targets; keep each one
+        # that is not too close to a target already kept
+        points = positions[in_range]
+        deltas = points[:, None, :] - points[None, :, :]
+        pair_dist_sq = np.einsum('ijk,ijk->ij', deltas, deltas)
+        kept: List[int] = []
+        for i in range(len(points)):
+            if not kept or pair_dist_sq[i, kept].min() >= 50 * 50:
+                kept.append(i)
+        
+        return [targets[i] for i in in_range[kept]]
 
     def _is_too_close(self, target: Target, existing_targets: List[Target], min_distance: int = 50) -> bool:
         """Check if a target is too close to existing targets.
@@ -277,9 +402,9 @@ class TargetDetector:
         for existing in existing_targets:
             dx = target['position'][0] - existing['position'][0]
             dy = target['position'][1] - existing['position'][1]
-            distance = np.sqrt(dx**2 + dy**2)
             
-            if distance < min_distance:
+            # Compare squared distances to skip the square root
+            if dx * dx + dy * dy < min_distance * min_distance:
                 return True
                 
         return False 
\ No newline at end of file
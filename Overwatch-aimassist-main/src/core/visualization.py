@@ -1,31 +1,134 @@
 import cv2
 import numpy as np
 import math
+from functools import lru_cache
+from types import MappingProxyType
 from typing import List, Tuple, Optional, Dict, Any
+from .config import Config
 from .target_detection import Target
+from src.utils.jit import njit
+
+# Unit cube vertices: bottom face, then top face
+CUBE_CORNERS = np.array([
+    (0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0),
+    (0, 0, 1), (1, 0, 1), (1, 1, 1), (0, 1, 1)
+], dtype=np.float64)
+
+# Cube edges as pairs of vertex indices
+CUBE_EDGES = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 0),  # Bottom face
+    (4, 5), (5, 6), (6, 7), (7, 4),  # Top face
+    (0, 4), (1, 5), (2, 6), (3, 7)   # Connecting edges
+], dtype=np.intp)
+
+# Wireframe color for each target type, shared read-only by all visualizers
+TARGET_COLORS = MappingProxyType({
+    "enemy": (0, 0, 255),  # Red
+    "ally": (0, 255, 0),   # Green
+    "neutral": (255, 255, 0)  # Yellow
+})
+
+# Camera used for the vision overlay's visibility check
+VIEW_EYE = np.zeros(3, dtype=np.float64)
+VIEW_FORWARD = np.array([0, 0, 1], dtype=np.float64)
+
+# Single points skip the array round trip of _transform_points, and keep full
+# float64 precision
+@njit("UniTuple(f8, 2)(f8, f8, f8, f8, f8)", cache=True)
+def _project_point_kernel(x: float, y: float, scale: float, tx: float, ty: float) -> Tuple[float, float]:
+    """Orthographic projection of one point (z is dropped), compiled to native code"""
+    return x * scale + tx, y * -scale + ty
+
+# Projected primitives kept per visualizer; cleared with the projection on resize
+PROJECTION_CACHE_SIZE = 1024
 
 class GameVisualizer:
-    """Visualizes game world and targets using primitive shapes"""
+    """Visualizes game world and targets using primitive shapes
+    
+    Frames returned by draw_targets, draw_world and draw_primitive come from a
+    ring of FRAME_BUFFERS reusable buffers; copy a frame to keep it longer.
+    """
+    
+    FRAME_BUFFERS = 3
+    DEFAULT_COLOR = (255, 255, 255)  # For primitives and unknown target types
     
     def __init__(self):
         self.window_name = "Overwatch Vision"
-        self.window_size = (800, 600)
+        self.projection_scale = 2.0
+        self._world_bg = None     # Rendered grid and axes, reused by draw_world
+        self._overlay_buf = None  # Scratch frame for add_vision_overlay
+        self._frame_bufs = []     # Ring of window-sized output frames
+        self._frame_index = 0
+        self._effect_bufs = {}    # Vision effect scratch and output buffers, by name
+        self._use_umat = Config.USE_OPENCL and cv2.ocl.haveOpenCL()  # Effects via cv2.UMat
+        self.window_size = (800, 600)  # Also builds the projection matrix
         self.is_running = False
-        self.colors = {
-            "enemy": (0, 0, 255),  # Red
-            "ally": (0, 255, 0),   # Green
-            "neutral": (255, 255, 0)  # Yellow
-        }
+        self.colors = TARGET_COLORS  # Assign a new dict to customize
         self.vision_effects = {
             "thermal": self._apply_thermal_effect,
             "night_vision": self._apply_night_vision,
             "outline": self._apply_outline
         }
+        self._primitives = {
+            "cube": self._draw_cube,
+            "sphere": self._draw_sphere,
+            "cylinder": self._draw_cylinder
+        }
+    
+    @property
+    def window_size(self) -> Tuple[int, int]:
+        """Window size as (width, height)"""
+        return self._window_size
+    
+    @window_size.setter
+    def window_size(self, size: Tuple[int, int]) -> None:
+        self._window_size = tuple(size)
+        self._build_projection_matrix()
+        self._project_cube = lru_cache(maxsize=PROJECTION_CACHE_SIZE)(self._project_cube_points)
+        self._project_cylinder = lru_cache(maxsize=PROJECTION_CACHE_SIZE)(self._project_cylinder_centers)
+        self._world_bg = None
+        self._frame_bufs = []
+        self._frame_index = 0
+    
+    def _build_projection_matrix(self) -> None:
+        """Build the orthographic world-to-pixel transform for the current window size
+        
+        Orthographic projection never divides by w, so it is kept as a linear
+        part and a translation instead of a homogeneous matrix.
+        """
+        scale = self.projection_scale
+        self._R = np.array([
+            [scale, 0, 0],
+            [0, -scale, 0]  # Flip Y axis
+        ], dtype=np.float32)
+        self._t = np.array([self._window_size[0] / 2, self._window_size[1] / 2], dtype=np.float32)
+        # Same transform as Python floats, for _project_point_kernel
+        self._point_transform = (float(scale), self._window_size[0] / 2, self._window_size[1] / 2)
+    
+    def _next_frame(self, clear: bool = True) -> np.ndarray:
+        """Take the next window-sized frame from the buffer ring, cleared to black"""
+        if len(self._frame_bufs) < self.FRAME_BUFFERS:
+            frame = np.zeros((self.window_size[1], self.window_size[0], 3), dtype=np.uint8)
+            self._frame_bufs.append(frame)
+            return frame
+        frame = self._frame_bufs[self._frame_index]
+        self._frame_index = (self._frame_index + 1) % self.FRAME_BUFFERS
+        if clear:
+            frame.fill(0)
+        return frame
+    
+    def _effect_buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """Reusable uint8 buffer for vision effects, reallocated when the shape changes"""
+        buf = self._effect_bufs.get(name)
+        if buf is None or buf.shape != shape:
+            buf = self._effect_bufs[name] = np.zeros(shape, dtype=np.uint8)
+        return buf
     
     def create_window(self) -> None:
         """Create visualization window"""
         cv2.namedWindow(self.window_name, cv2.WINDOW_NORMAL)
         cv2.resizeWindow(self.window_name, *self.window_size)
+        self._world_bg = None
         self.is_running = True
     
     def close_window(self) -> None:
@@ -35,64 +138,121 @@ class GameVisualizer:
     
     def draw_targets(self, targets: List[Target]) -> np.ndarray:
         """Draw detected targets"""
-        frame = np.zeros((self.window_size[1], self.window_size[0], 3), dtype=np.uint8)
+        frame = self._next_frame()
+        if not targets:
+            return frame
         
-        for target in targets:
-            # Draw target as a cube
-            self._draw_cube(frame, target.position, target.size, self.colors.get(target.type, (255, 255, 255)))
-            
-            # Draw target info
-            self._draw_target_info(frame, target)
+        # Project every target's cube at once, then draw each color's edges in one call
+        positions = np.array([target.position for target in targets], dtype=np.float64)
+        sizes = np.array([target.size for target in targets], dtype=np.float64)
+        points_3d = positions[:, None, :] + CUBE_CORNERS * sizes[:, None, :]
+        segments = self._project_points(points_3d.reshape(-1, 3)).reshape(len(targets), 8, 2)[:, CUBE_EDGES]
+        
+        colors = self.colors
+        default = self.DEFAULT_COLOR
+        by_color: Dict[Tuple[int, int, int], List[int]] = {}
+        for i, target in enumerate(targets):
+            by_color.setdefault(colors.get(target.type, default), []).append(i)
+        for color, indices in by_color.items():
+            cv2.polylines(frame, segments[indices].reshape(-1, 2, 2), False, color, 2)
+        
+        # Draw target info, projecting all centers at once
+        centers_2d = self._transform_points([target.get_center() for target in targets])
+        for target, center in zip(targets, centers_2d.tolist()):
+            if target.health is not None:
+                self._draw_health_bar(frame, center, target.health)
         
         return frame
     
     def draw_world(self) -> np.ndarray:
         """Draw game world representation"""
-        frame = np.zeros((self.window_size[1], self.window_size[0], 3), dtype=np.uint8)
-        
-        # Draw ground plane
-        self._draw_ground_plane(frame)
-        
-        # Draw coordinate system
-        self._draw_coordinate_system(frame)
+        # The world is static, so it is only rendered again after a resize
+        if self._world_bg is None:
+            frame = np.zeros((self.window_size[1], self.window_size[0], 3), dtype=np.uint8)
+            
+            # Draw ground plane
+            self._draw_ground_plane(frame)
+            
+            # Draw coordinate system
+            self._draw_coordinate_system(frame)
+            
+            self._world_bg = frame
         
+        frame = self._next_frame(clear=False)
+        np.copyto(frame, self._world_bg)
         return frame
     
     def add_vision_overlay(self, base_frame: np.ndarray, targets: List[Target]) -> np.ndarray:
-        """Add vision overlay to base frame"""
-        overlay = np.zeros_like(base_frame)
-        
-        # Draw targets with vision effects
-        for target in targets:
-            if target.is_visible((0, 0, 0), (0, 0, 1)):  # Simple visibility check
-                self._draw_target_with_vision(overlay, target)
+        """Add vision overlay to base frame
         
-        # Blend overlay with base frame
+        The overlay is only a few circles, so the frame is dimmed in one pass
+        and the full blend is done just inside each circle's bounding box.
+        """
         alpha = 0.7
-        return cv2.addWeighted(base_frame, 1 - alpha, overlay, alpha, 0)
+        
+        # Without overlay pixels the blend reduces to scaling the base frame
+        result = cv2.convertScaleAbs(base_frame, alpha=1 - alpha)
+        if not targets:
+            return result
+        
+        # The overlay buffer is kept all zeros between calls; only the boxes drawn into are cleared
+        overlay = self._overlay_buf
+        if overlay is None or overlay.shape != base_frame.shape or overlay.dtype != base_frame.dtype:
+            overlay = self._overlay_buf = np.zeros_like(base_frame)
+        height, width = base_frame.shape[:2]
+        
+        # Simple visibility check for all targets at once: the center must be
+        # in front of a camera at the origin looking along +z
+        centers = np.array([target.get_center() for target in targets], dtype=np.float64)
+        visible = np.flatnonzero((centers - VIEW_EYE) @ VIEW_FORWARD > 0)
+        centers_2d = self._project_points(centers[visible])
+        
+        # Draw visible targets with vision effects
+        boxes = []
+        for i, (x, y) in zip(visible, centers_2d.tolist()):
+            target = targets[i]
+            radius = int(target.size[0] / 2)
+            x0, y0 = max(x - radius - 2, 0), max(y - radius - 2, 0)
+            x1, y1 = min(x + radius + 3, width), min(y + radius + 3, height)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            color = (0, 0, 255) if target.type == "enemy" else (0, 255, 0)
+            cv2.circle(overlay, (x, y), radius, color, 2)
+            boxes.append((slice(y0, y1), slice(x0, x1)))
+        
+        # Blend overlay with base frame where it was drawn
+        for box in boxes:
+            cv2.addWeighted(base_frame[box], 1 - alpha, overlay[box], alpha, 0, dst=result[box])
+        for box in boxes:
+            overlay[box] = 0
+        
+        return result
     
     def draw_primitive(self, obj_type: str, position: Tuple[float, float, float], size: Any) -> np.ndarray:
         """Draw primitive object"""
-        frame = np.zeros((self.window_size[1], self.window_size[0], 3), dtype=np.uint8)
+        frame = self._next_frame()
         
-        if obj_type == "cube":
-            self._draw_cube(frame, position, size, (255, 255, 255))
-        elif obj_type == "sphere":
-            self._draw_sphere(frame, position, size, (255, 255, 255))
-        elif obj_type == "cylinder":
-            self._draw_cylinder(frame, position, size, (255, 255, 255))
+        draw = self._primitives.get(obj_type)
+        if draw is not None:
+            draw(frame, position, size, self.DEFAULT_COLOR)
         
         return frame
     
     def visualize_depth(self, depth_map: np.ndarray) -> np.ndarray:
         """Visualize depth map"""
-        # Normalize depth map to 0-255
-        depth_normalized = cv2.normalize(depth_map, None, 0, 255, cv2.NORM_MINMAX)
-        depth_colored = cv2.applyColorMap(depth_normalized.astype(np.uint8), cv2.COLORMAP_JET)
+        # Normalize depth map to 0-255, writing uint8 directly instead of via a float copy
+        depth_normalized = cv2.normalize(depth_map, self._effect_buffer("depth", depth_map.shape[:2]),
+                                         0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+        depth_colored = cv2.applyColorMap(depth_normalized, cv2.COLORMAP_JET)
         return depth_colored
     
     def apply_vision_effect(self, frame: np.ndarray, effect: str) -> np.ndarray:
-        """Apply vision effect to frame"""
+        """Apply vision effect to frame
+        
+        The result is a buffer owned by the effect and overwritten by its next
+        call; copy it to keep it. With OpenCL enabled the effect runs on
+        cv2.UMat and the result is a new array.
+        """
         if effect in self.vision_effects:
             return self.vision_effects[effect](frame)
         return frame
@@ -100,51 +260,61 @@ class GameVisualizer:
     def _draw_cube(self, frame: np.ndarray, position: Tuple[float, float, float], 
                   size: Tuple[float, float, float], color: Tuple[int, int, int]) -> None:
         """Draw 3D cube"""
-        # Project 3D points to 2D
-        points_3d = self._get_cube_points(position, size)
-        points_2d = self._project_points(points_3d)
-        
-        # Draw cube edges
-        edges = [
-            (0, 1), (1, 2), (2, 3), (3, 0),  # Bottom face
-            (4, 5), (5, 6), (6, 7), (7, 4),  # Top face
-            (0, 4), (1, 5), (2, 6), (3, 7)   # Connecting edges
-        ]
-        
-        for edge in edges:
-            pt1 = tuple(map(int, points_2d[edge[0]]))
-            pt2 = tuple(map(int, points_2d[edge[1]]))
-            cv2.line(frame, pt1, pt2, color, 2)
+        # Project 3D points to 2D (cached for repeated geometry)
+        points_2d = self._project_cube(tuple(position), tuple(size))
+        
+        # Nothing to draw if the whole cube projects outside the frame
+        x_min, y_min = points_2d.min(axis=0).tolist()
+        x_max, y_max = points_2d.max(axis=0).tolist()
+        if self._is_off_screen(frame, x_min, y_min, x_max, y_max, 2):
+            return
+        
+        # Draw all cube edges in one call
+        cv2.polylines(frame, points_2d[CUBE_EDGES], False, color, 2)
     
     def _draw_sphere(self, frame: np.ndarray, position: Tuple[float, float, float], 
                     radius: float, color: Tuple[int, int, int]) -> None:
         """Draw sphere"""
         # Project center to 2D
-        center_2d = self._project_point(position)
+        center_x, center_y = map(int, self._project_point(position))
+        radius = int(radius)
+        if self._is_off_screen(frame, center_x - radius, center_y - radius,
+                               center_x + radius, center_y + radius, 2):
+            return
         
         # Draw circle
-        cv2.circle(frame, tuple(map(int, center_2d)), int(radius), color, 2)
+        cv2.circle(frame, (center_x, center_y), radius, color, 2)
     
     def _draw_cylinder(self, frame: np.ndarray, position: Tuple[float, float, float], 
                       size: Tuple[float, float], color: Tuple[int, int, int]) -> None:
         """Draw cylinder"""
         radius, height = size
         
-        # Draw top and bottom circles
-        top_center = self._project_point((position[0], position[1], position[2] + height))
-        bottom_center = self._project_point(position)
+        top_center, bottom_center = self._project_cylinder(tuple(position), height)
         
-        cv2.circle(frame, tuple(map(int, top_center)), int(radius), color, 2)
-        cv2.circle(frame, tuple(map(int, bottom_center)), int(radius), color, 2)
+        # Skip everything if both circles, and so the lines between them, are off screen
+        if self._is_off_screen(frame,
+                               min(top_center[0], bottom_center[0]) - radius,
+                               min(top_center[1], bottom_center[1]) - radius,
+                               max(top_center[0], bottom_center[0]) + radius,
+                               max(top_center[1], bottom_center[1]) + radius, 2):
+            return
+        
+        top_x, top_y = top_center
+        bottom_x, bottom_y = bottom_center
+        
+        # Draw top and bottom circles
+        cv2.circle(frame, (int(top_x), int(top_y)), int(radius), color, 2)
+        cv2.circle(frame, (int(bottom_x), int(bottom_y)), int(radius), color, 2)
         
         # Draw connecting lines
-        cv2.line(frame, 
-                tuple(map(int, (top_center[0] + radius, top_center[1]))),
-                tuple(map(int, (bottom_center[0] + radius, bottom_center[1]))),
+        cv2.line(frame,
+                (int(top_x + radius), int(top_y)),
+                (int(bottom_x + radius), int(bottom_y)),
                 color, 2)
         cv2.line(frame,
-                tuple(map(int, (top_center[0] - radius, top_center[1]))),
-                tuple(map(int, (bottom_center[0] - radius, bottom_center[1]))),
+                (int(top_x - radius), int(top_y)),
+                (int(bottom_x - radius), int(bottom_y)),
                 color, 2)
     
     def _draw_ground_plane(self, frame: np.ndarray) -> None:
@@ -153,126 +323,151 @@ class GameVisualizer:
         grid_size = 100
         grid_spacing = 20
         
-        for i in range(-grid_size, grid_size + 1, grid_spacing):
-            # Draw horizontal lines
-            pt1 = self._project_point((i, -grid_size, 0))
-            pt2 = self._project_point((i, grid_size, 0))
-            cv2.line(frame, tuple(map(int, pt1)), tuple(map(int, pt2)), (50, 50, 50), 1)
-            
-            # Draw vertical lines
-            pt1 = self._project_point((-grid_size, i, 0))
-            pt2 = self._project_point((grid_size, i, 0))
-            cv2.line(frame, tuple(map(int, pt1)), tuple(map(int, pt2)), (50, 50, 50), 1)
+        # Endpoints of all horizontal and vertical lines, projected at once
+        ticks = np.arange(-grid_size, grid_size + 1, grid_spacing, dtype=np.float32)
+        endpoints = np.zeros((len(ticks), 4, 3), dtype=np.float32)
+        endpoints[:, 0, :2] = np.stack([ticks, np.full_like(ticks, -grid_size)], axis=1)
+        endpoints[:, 1, :2] = np.stack([ticks, np.full_like(ticks, grid_size)], axis=1)
+        endpoints[:, 2, :2] = np.stack([np.full_like(ticks, -grid_size), ticks], axis=1)
+        endpoints[:, 3, :2] = np.stack([np.full_like(ticks, grid_size), ticks], axis=1)
+        segments = self._project_points(endpoints.reshape(-1, 3)).reshape(-1, 2, 2)
+        
+        # Only draw grid lines that reach into the frame
+        height, width = frame.shape[:2]
+        lo = segments.min(axis=1)
+        hi = segments.max(axis=1)
+        on_screen = (hi[:, 0] >= -1) & (hi[:, 1] >= -1) & (lo[:, 0] <= width) & (lo[:, 1] <= height)
+        
+        for start, end in segments[on_screen].tolist():
+            cv2.line(frame, tuple(start), tuple(end), (50, 50, 50), 1)
     
     def _draw_coordinate_system(self, frame: np.ndarray) -> None:
         """Draw coordinate system"""
-        origin = self._project_point((0, 0, 0))
+        # Project origin and axis ends together
+        origin, x_axis, y_axis, z_axis = map(tuple, self._project_points(
+            [(0, 0, 0), (100, 0, 0), (0, 100, 0), (0, 0, 100)]
+        ))
         
         # Draw axes
-        x_axis = self._project_point((100, 0, 0))
-        y_axis = self._project_point((0, 100, 0))
-        z_axis = self._project_point((0, 0, 100))
-        
-        cv2.line(frame, tuple(map(int, origin)), tuple(map(int, x_axis)), (0, 0, 255), 2)  # X - Red
-        cv2.line(frame, tuple(map(int, origin)), tuple(map(int, y_axis)), (0, 255, 0), 2)  # Y - Green
-        cv2.line(frame, tuple(map(int, origin)), tuple(map(int, z_axis)), (255, 0, 0), 2)  # Z - Blue
+        cv2.line(frame, origin, x_axis, (0, 0, 255), 2)  # X - Red
+        cv2.line(frame, origin, y_axis, (0, 255, 0), 2)  # Y - Green
+        cv2.line(frame, origin, z_axis, (255, 0, 0), 2)  # Z - Blue
     
     def _draw_target_info(self, frame: np.ndarray, target: Target) -> None:
         """Draw target information"""
-        center = self._project_point(target.get_center())
-        
         # Draw health bar if available
         if target.health is not None:
-            health_width = 50
-            health_height = 5
-            health_x = int(center[0] - health_width / 2)
-            health_y = int(center[1] - 30)
-            
-            # Background
-            cv2.rectangle(frame, (health_x, health_y), 
-                         (health_x + health_width, health_y + health_height), 
-                         (50, 50, 50), -1)
-            
-            # Health
-            health_amount = int(health_width * target.health)
-            cv2.rectangle(frame, (health_x, health_y), 
-                         (health_x + health_amount, health_y + health_height), 
-                         (0, 255, 0), -1)
-    
-    def _draw_target_with_vision(self, frame: np.ndarray, target: Target) -> None:
-        """Draw target with vision effects"""
-        # Draw target outline
-        center = self._project_point(target.get_center())
-        radius = int(target.size[0] / 2)
-        
-        # Draw thermal effect
-        if target.type == "enemy":
-            cv2.circle(frame, tuple(map(int, center)), radius, (0, 0, 255), 2)
-        else:
-            cv2.circle(frame, tuple(map(int, center)), radius, (0, 255, 0), 2)
+            self._draw_health_bar(frame, self._project_point(target.get_center()), target.health)
     
-    def _get_cube_points(self, position: Tuple[float, float, float], 
-                        size: Tuple[float, float, float]) -> List[Tuple[float, float, float]]:
-        """Get cube vertices"""
-        x, y, z = position
-        w, h, d = size
+    def _draw_health_bar(self, frame: np.ndarray, center: Tuple[float, float], health: float) -> None:
+        """Draw a health bar above a projected target center"""
+        health_width = 50
+        health_height = 5
+        health_x = int(center[0] - health_width / 2)
+        health_y = int(center[1] - 30)
         
-        return [
-            (x, y, z), (x + w, y, z), (x + w, y + h, z), (x, y + h, z),  # Bottom face
-            (x, y, z + d), (x + w, y, z + d), (x + w, y + h, z + d), (x, y + h, z + d)  # Top face
-        ]
+        # Background
+        cv2.rectangle(frame, (health_x, health_y), 
+                     (health_x + health_width, health_y + health_height), 
+                     (50, 50, 50), -1)
+        
+        # Health
+        health_amount = int(health_width * health)
+        cv2.rectangle(frame, (health_x, health_y), 
+                     (health_x + health_amount, health_y + health_height), 
+                     (0, 255, 0), -1)
+    
+    def _is_off_screen(self, frame: np.ndarray, x_min: float, y_min: float,
+                       x_max: float, y_max: float, margin: int = 0) -> bool:
+        """Check if a 2D bounding box, grown by margin pixels, lies entirely outside the frame"""
+        height, width = frame.shape[:2]
+        return (x_max + margin < 0 or y_max + margin < 0 or
+                x_min - margin >= width or y_min - margin >= height)
+    
+    def _get_cube_points(self, position: Tuple[float, float, float], 
+                        size: Tuple[float, float, float]) -> np.ndarray:
+        """Get cube vertices as an (8, 3) array"""
+        return np.asarray(position, dtype=np.float64) + CUBE_CORNERS * np.asarray(size, dtype=np.float64)
     
-    def _project_points(self, points_3d: List[Tuple[float, float, float]]) -> List[Tuple[float, float]]:
-        """Project 3D points to 2D"""
-        return [self._project_point(p) for p in points_3d]
+    def _project_cube_points(self, position: Tuple[float, float, float],
+                             size: Tuple[float, float, float]) -> np.ndarray:
+        """Project cube vertices to a read-only (8, 2) int32 array (cached as _project_cube)"""
+        points_2d = self._project_points(self._get_cube_points(position, size))
+        points_2d.flags.writeable = False
+        return points_2d
+    
+    def _project_cylinder_centers(self, position: Tuple[float, float, float],
+                                  height: float) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """Project a cylinder's top and bottom centers (cached as _project_cylinder)"""
+        top, bottom = self._transform_points(
+            [(position[0], position[1], position[2] + height), position]
+        ).tolist()
+        return tuple(top), tuple(bottom)
+    
+    def _transform_points(self, points_3d: List[Tuple[float, float, float]]) -> np.ndarray:
+        """Apply the projection to 3D points, giving (N, 2) float coordinates"""
+        pts = np.asarray(points_3d, dtype=np.float32).reshape(-1, 3)
+        return pts @ self._R.T + self._t
+    
+    def _project_points(self, points_3d: List[Tuple[float, float, float]]) -> np.ndarray:
+        """Project 3D points to 2D pixel coordinates, as an (N, 2) int32 array"""
+        return self._transform_points(points_3d).astype(np.int32)
     
     def _project_point(self, point_3d: Tuple[float, float, float]) -> Tuple[float, float]:
         """Project single 3D point to 2D"""
-        # Simple orthographic projection
-        x, y, z = point_3d
-        scale = 2.0
-        
-        # Center the projection
-        center_x = self.window_size[0] / 2
-        center_y = self.window_size[1] / 2
-        
-        # Project to 2D
-        x_2d = center_x + x * scale
-        y_2d = center_y - y * scale  # Flip Y axis
-        
-        return (x_2d, y_2d)
+        return _project_point_kernel(point_3d[0], point_3d[1], *self._point_transform)
     
     def _apply_thermal_effect(self, frame: np.ndarray) -> np.ndarray:
         """Apply thermal vision effect"""
+        shape = frame.shape[:2]
+        
+        if self._use_umat:
+            gray = cv2.cvtColor(cv2.UMat(frame), cv2.COLOR_BGR2GRAY)
+            return cv2.applyColorMap(gray, cv2.COLORMAP_JET).get()
+        
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._effect_buffer("gray", shape))
         
         # Apply colormap
-        thermal = cv2.applyColorMap(gray, cv2.COLORMAP_JET)
+        thermal = cv2.applyColorMap(gray, cv2.COLORMAP_JET, dst=self._effect_buffer("thermal", shape + (3,)))
         
         return thermal
     
     def _apply_night_vision(self, frame: np.ndarray) -> np.ndarray:
         """Apply night vision effect"""
+        shape = frame.shape[:2]
+        
+        if self._use_umat:
+            gray = cv2.cvtColor(cv2.UMat(frame), cv2.COLOR_BGR2GRAY)
+            zero = cv2.UMat(self._effect_buffer("zero", shape))
+            return cv2.merge((zero, gray, zero)).get()
+        
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._effect_buffer("gray", shape))
         
-        # Apply green tint
-        night_vision = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
-        night_vision[:, :, 0] = 0  # Remove blue
-        night_vision[:, :, 2] = 0  # Remove red
+        # Apply green tint: gray goes to the green channel only
+        zero = self._effect_buffer("zero", shape)
+        night_vision = cv2.merge((zero, gray, zero), dst=self._effect_buffer("night_vision", shape + (3,)))
         
         return night_vision
     
     def _apply_outline(self, frame: np.ndarray) -> np.ndarray:
         """Apply outline effect"""
+        shape = frame.shape[:2]
+        
+        if self._use_umat:
+            gray = cv2.cvtColor(cv2.UMat(frame), cv2.COLOR_BGR2GRAY)
+            edges = cv2.Canny(gray, 100, 200)
+            return cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR).get()
+        
         # Convert to grayscale
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._effect_buffer("gray", shape))
         
         # Apply edge detection
-        edges = cv2.Canny(gray, 100, 200)
+        edges = cv2.Canny(gray, 100, 200, edges=self._effect_buffer("edges", shape))
         
-        # Convert back to BGR
-        outline = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR)
+        # Replicate edges into all three BGR channels (OpenCV's SIMD path; a
+        # broadcast np.copyto is much slower)
+        outline = cv2.cvtColor(edges, cv2.COLOR_GRAY2BGR, dst=self._effect_buffer("outline", shape + (3,)))
         
-        return outline 
\ No newline at end of file
+        return outline
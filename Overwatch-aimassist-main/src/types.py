@@ -1,5 +1,6 @@
 """Type definitions for the Overwatch Aim Assist project."""
 
+from dataclasses import dataclass
 from typing import TypedDict, List, Tuple, Optional, Union, Dict, Any
 import numpy as np
 
@@ -17,6 +18,49 @@ class Target(TypedDict):
     velocity: Optional[Vector]
     class_id: int
 
+@dataclass
+class TargetBatch:
+    """Targets stored as parallel arrays, one row per target."""
+    positions: np.ndarray    # (N, 2) int32
+    sizes: np.ndarray        # (N,) int32
+    confidences: np.ndarray  # (N,) float32
+    velocities: np.ndarray   # (N, 2) float32, NaN where unknown
+    class_ids: np.ndarray    # (N,) int32
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    @classmethod
+    def from_targets(cls, targets: List[Target]) -> "TargetBatch":
+        """Build a batch from a list of Target dicts."""
+        count = len(targets)
+        velocities = np.full((count, 2), np.nan, dtype=np.float32)
+        for i, target in enumerate(targets):
+            if target['velocity'] is not None:
+                velocities[i] = target['velocity']
+        return cls(
+            positions=np.array([t['position'] for t in targets], dtype=np.int32).reshape(count, 2),
+            sizes=np.array([t['size'] for t in targets], dtype=np.int32),
+            confidences=np.array([t['confidence'] for t in targets], dtype=np.float32),
+            velocities=velocities,
+            class_ids=np.array([t['class_id'] for t in targets], dtype=np.int32)
+        )
+
+    def as_dicts(self) -> List[Target]:
+        """Convert back to a list of Target dicts."""
+        return [
+            {
+                'position': (int(x), int(y)),
+                'size': int(size),
+                'confidence': float(confidence),
+                'velocity': None if np.isnan(vx) else (float(vx), float(vy)),
+                'class_id': int(class_id)
+            }
+            for (x, y), size, confidence, (vx, vy), class_id in zip(
+                self.positions, self.sizes, self.confidences, self.velocities, self.class_ids
+            )
+        ]
+
 class AimState(TypedDict):
     """Represents the current state of aim assistance."""
     enabled: bool
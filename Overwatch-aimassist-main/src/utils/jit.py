@@ -0,0 +1,19 @@
+"""
+Optional Numba support for Overwatch Aim Assist
+
+Numeric kernels are decorated with `njit` from this module. When Numba is
+not installed the decorator leaves the function untouched and the kernels
+run as plain Python.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -3,11 +3,26 @@ Profile management functions for Overwatch Aim Assist
 """
 
 import os
+import glob
+import stat
 import json
 import logging
 from typing import List
 from src.core.config import Config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Parsed profiles keyed by path, and profile listings keyed by directory;
+# each entry is reused while the file's (mtime, size) stamp is unchanged
+_profile_cache = {}
+_dir_cache = {}
+
+def _stamp(st: os.stat_result) -> tuple:
+    return st.st_mtime_ns, st.st_size
+
 def save_profile(profile_name: str) -> bool:
     """Save current settings to profile"""
     try:
@@ -17,9 +32,13 @@ def save_profile(profile_name: str) -> bool:
         if not os.path.exists(Config.PROFILES_DIR):
             os.makedirs(Config.PROFILES_DIR)
             
+        # Saves are rare, so they always use json for one on-disk format (orjson
+        # can only indent by two spaces)
         profile_path = os.path.join(Config.PROFILES_DIR, f"{profile_name}.json")
         with open(profile_path, 'w') as f:
             json.dump(Config.to_dict(), f, indent=4)
+        _profile_cache.pop(profile_path, None)
+        _dir_cache.pop(Config.PROFILES_DIR, None)
             
         logging.info(f"Profile {profile_name} saved")
         return True
@@ -31,12 +50,23 @@ def load_profile(profile_name: str) -> bool:
     """Load settings from profile"""
     try:
         profile_path = os.path.join(Config.PROFILES_DIR, f"{profile_name}.json")
-        if not os.path.exists(profile_path):
+        try:
+            stamp = _stamp(os.stat(profile_path))
+        except FileNotFoundError:
             logging.error(f"Profile {profile_name} not found")
             return False
-            
-        with open(profile_path, 'r') as f:
-            data = json.load(f)
+        
+        cached = _profile_cache.get(profile_path)
+        if cached is not None and cached[0] == stamp:
+            data = cached[1]
+        else:
+            if orjson is not None:
+                with open(profile_path, 'rb') as f:
+                    data = orjson.loads(f.read())
+            else:
+                with open(profile_path, 'r') as f:
+                    data = json.load(f)
+            _profile_cache[profile_path] = (stamp, data)
             
         Config.from_dict(data)
         logging.info(f"Profile {profile_name} loaded")
@@ -47,11 +77,22 @@ def load_profile(profile_name: str) -> bool:
 
 def list_profiles() -> List[str]:
     """Return list of available profiles"""
-    if not os.path.exists(Config.PROFILES_DIR):
+    profiles_dir = Config.PROFILES_DIR
+    try:
+        st = os.stat(profiles_dir)
+    except OSError:
         return []
-        
-    profiles = []
-    for file in os.listdir(Config.PROFILES_DIR):
-        if file.endswith('.json'):
-            profiles.append(file[:-5])
-    return profiles 
\ No newline at end of file
+    if not stat.S_ISDIR(st.st_mode):
+        return []
+    
+    # Adding or removing a file updates the directory mtime
+    stamp = _stamp(st)
+    cached = _dir_cache.get(profiles_dir)
+    if cached is not None and cached[0] == stamp:
+        return list(cached[1])
+    
+    # Let glob match the extension instead of checking every entry in Python
+    pattern = os.path.join(glob.escape(profiles_dir), '*.json')
+    profiles = [os.path.basename(path)[:-5] for path in glob.iglob(pattern)]
+    _dir_cache[profiles_dir] = (stamp, profiles)
+    return list(profiles)
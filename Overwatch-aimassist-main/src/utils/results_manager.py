@@ -1,17 +1,44 @@
 import os
 import json
+import time
+import queue
 import logging
+import logging.handlers
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List
+import cv2
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JPEG quality for queued shot screenshots
+SCREENSHOT_JPEG_QUALITY = 85
+
+# Screenshot files are encoded and written by a small pool; at most
+# SCREENSHOT_BACKLOG of them are in flight before the writer thread waits
+SCREENSHOT_WORKERS = 2
+SCREENSHOT_BACKLOG = 32
+
+# Event categories, each appended to its own JSON Lines file in the session directory
+EVENT_CATEGORIES = ("shots", "hits", "target_detections", "predictions", "misses", "difficulties")
 
 class ResultsManager:
     def __init__(self, base_dir: str = "results"):
         self.base_dir = Path(base_dir)
+        self._stamp_second = None
+        self._stamp_prefix = ""
         self.date_dir = self._create_date_directory()
         self.session_dir = self._create_session_directory()
         self._setup_logging()
         self._create_subdirectories()
+        self._start_writer()
         
     def _create_date_directory(self) -> Path:
         """Создает директорию с датой для всех сессий"""
@@ -28,111 +55,254 @@ class ResultsManager:
         return session_dir
     
     def _setup_logging(self):
-        """Настраивает систему логирования"""
-        log_file = self.session_dir / "main.log"
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
+        """Настраивает систему логирования
+        
+        Вызовы логгера только кладут запись в очередь; запись в файл и вывод
+        в консоль выполняет поток QueueListener.
+        """
         self.logger = logging.getLogger("ResultsManager")
+        self._log_listener = None
+        
+        root = logging.getLogger()
+        if root.handlers:
+            # Логирование уже настроено (как и basicConfig, ничего не меняем)
+            return
+        
+        log_file = self.session_dir / "main.log"
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handlers = [logging.FileHandler(log_file), logging.StreamHandler()]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.SimpleQueue()
+        self._queue_handler = logging.handlers.QueueHandler(log_queue)
+        self._log_listener = logging.handlers.QueueListener(log_queue, *handlers)
+        self._log_listener.start()
+        
+        root.setLevel(logging.INFO)
+        root.addHandler(self._queue_handler)
     
     def _create_subdirectories(self):
         """Создает поддиректории для различных типов данных"""
         self.directories = {
-            "shots": self.session_dir / "shots",
-            "hits": self.session_dir / "hits",
-            "target_detections": self.session_dir / "target_detections",
-            "predictions": self.session_dir / "predictions",
-            "misses": self.session_dir / "misses",
-            "difficulties": self.session_dir / "difficulties",
             "metrics": self.session_dir / "metrics",
             "screenshots": self.session_dir / "screenshots"
         }
         
         for dir_path in self.directories.values():
             dir_path.mkdir(exist_ok=True)
+        
+        # События дописываются построчно в один файл на категорию
+        self._event_files = {
+            category: open(self.session_dir / f"{category}.jsonl", "ab", buffering=8192)
+            for category in EVENT_CATEGORIES
+        }
+        
+        # Счетчики записей за сессию, чтобы сводка не сканировала директории
+        self._counts = dict.fromkeys(EVENT_CATEGORIES + tuple(self.directories), 0)
     
     def log_shot(self, shot_data: Dict[str, Any]):
         """Логирует информацию о выстреле"""
-        timestamp = datetime.now().strftime("%H%M%S_%f")
-        file_path = self.directories["shots"] / f"shot_{timestamp}.json"
-        self._save_json(file_path, shot_data)
-        self.logger.info(f"Shot logged: {shot_data}")
+        self._log_event("shots", shot_data, "Shot logged")
     
     def log_hit(self, hit_data: Dict[str, Any]):
         """Логирует информацию о попадании"""
-        timestamp = datetime.now().strftime("%H%M%S_%f")
-        file_path = self.directories["hits"] / f"hit_{timestamp}.json"
-        self._save_json(file_path, hit_data)
-        self.logger.info(f"Hit logged: {hit_data}")
+        self._log_event("hits", hit_data, "Hit logged")
     
     def log_target_detection(self, detection_data: Dict[str, Any]):
         """Логирует информацию об обнаружении цели"""
-        timestamp = datetime.now().strftime("%H%M%S_%f")
-        file_path = self.directories["target_detections"] / f"detection_{timestamp}.json"
-        self._save_json(file_path, detection_data)
-        self.logger.info(f"Target detection logged: {detection_data}")
+        self._log_event("target_detections", detection_data, "Target detection logged")
     
     def log_prediction(self, prediction_data: Dict[str, Any]):
         """Логирует информацию о предсказании движения"""
-        timestamp = datetime.now().strftime("%H%M%S_%f")
-        file_path = self.directories["predictions"] / f"prediction_{timestamp}.json"
-        self._save_json(file_path, prediction_data)
-        self.logger.info(f"Prediction logged: {prediction_data}")
+        self._log_event("predictions", prediction_data, "Prediction logged")
     
     def log_miss(self, miss_data: Dict[str, Any]):
         """Логирует информацию о промахе"""
-        timestamp = datetime.now().strftime("%H%M%S_%f")
-        file_path = self.directories["misses"] / f"miss_{timestamp}.json"
-        self._save_json(file_path, miss_data)
-        self.logger.info(f"Miss logged: {miss_data}")
+        self._log_event("misses", miss_data, "Miss logged")
     
     def log_difficulty(self, difficulty_data: Dict[str, Any]):
         """Логирует информацию о сложности ситуации"""
-        timestamp = datetime.now().strftime("%H%M%S_%f")
-        file_path = self.directories["difficulties"] / f"difficulty_{timestamp}.json"
-        self._save_json(file_path, difficulty_data)
-        self.logger.info(f"Difficulty logged: {difficulty_data}")
+        self._log_event("difficulties", difficulty_data, "Difficulty logged")
+    
+    def _log_event(self, category: str, data: Dict[str, Any], message: str):
+        """Ставит событие в очередь на запись в JSONL файл категории"""
+        self._counts[category] += 1
+        self._enqueue(category, data, message)
     
     def save_metrics(self, metrics_data: Dict[str, Any]):
         """Сохраняет метрики производительности"""
-        timestamp = datetime.now().strftime("%H%M%S")
+        timestamp = self._stamp()
         file_path = self.directories["metrics"] / f"metrics_{timestamp}.json"
-        self._save_json(file_path, metrics_data)
-        self.logger.info(f"Metrics saved: {metrics_data}")
+        self._counts["metrics"] += 1
+        self._enqueue(file_path, metrics_data, "Metrics saved")
     
     def save_screenshot(self, screenshot_data: bytes, metadata: Dict[str, Any]):
         """Сохраняет скриншот с метаданными"""
-        timestamp = datetime.now().strftime("%H%M%S_%f")
+        timestamp = self._stamp()
         screenshot_path = self.directories["screenshots"] / f"screenshot_{timestamp}.png"
         metadata_path = self.directories["screenshots"] / f"screenshot_{timestamp}_metadata.json"
         
-        with open(screenshot_path, "wb") as f:
-            f.write(screenshot_data)
-        self._save_json(metadata_path, metadata)
-        self.logger.info(f"Screenshot saved: {metadata}")
+        self._counts["screenshots"] += 1
+        self._enqueue(screenshot_path, screenshot_data)
+        self._enqueue(metadata_path, metadata, "Screenshot saved")
+    
+    def queue_screenshot(self, frame: np.ndarray, metadata: Dict[str, Any]):
+        """Сохраняет кадр как JPEG; кодирование выполняется в фоновом потоке"""
+        timestamp = self._stamp()
+        screenshot_path = self.directories["screenshots"] / f"screenshot_{timestamp}.jpg"
+        metadata_path = self.directories["screenshots"] / f"screenshot_{timestamp}_metadata.json"
+        
+        # Capture backends may reuse the frame's memory, so queue a private copy
+        self._counts["screenshots"] += 1
+        self._enqueue(screenshot_path, frame.copy())
+        self._enqueue(metadata_path, metadata, "Screenshot saved")
+    
+    def _stamp(self) -> str:
+        """Метка времени для имен файлов в формате HHMMSS_микросекунды
+        
+        strftime вызывается не чаще раза в секунду, остальное берется из time_ns.
+        """
+        seconds, ns = divmod(time.time_ns(), 1_000_000_000)
+        if seconds != self._stamp_second:
+            self._stamp_second = seconds
+            self._stamp_prefix = time.strftime("%H%M%S", time.localtime(seconds))
+        return f"{self._stamp_prefix}_{ns // 1000:06d}"
+    
+    def _start_writer(self):
+        """Запускает фоновый поток записи, чтобы файловый ввод-вывод не блокировал основной цикл"""
+        self._queue = deque(maxlen=10000)
+        self._pending = threading.Event()
+        self._idle = threading.Condition()
+        self._writing = False
+        self._io_pool = ThreadPoolExecutor(max_workers=SCREENSHOT_WORKERS, thread_name_prefix="ResultsIO")
+        self._io_slots = threading.BoundedSemaphore(SCREENSHOT_BACKLOG)
+        self._io_futures = set()
+        self._writer = threading.Thread(target=self._drain, name="ResultsWriter", daemon=True)
+        self._writer.start()
+    
+    def _enqueue(self, target, data, message: str = None):
+        """Ставит запись в очередь фонового потока
+        
+        target - путь к файлу или категория события из EVENT_CATEGORIES
+        """
+        self._queue.append((target, data, message))
+        self._pending.set()
+    
+    def _drain(self):
+        """Записывает накопленные записи пачками (фоновый поток)"""
+        while True:
+            self._pending.wait()
+            self._pending.clear()
+            with self._idle:
+                self._writing = True
+            while self._queue:
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), 256))]
+                touched = set()
+                for target, data, message in batch:
+                    try:
+                        if isinstance(target, str):
+                            event_file = self._event_files[target]
+                            event_file.write(self._dumps_line(data))
+                            touched.add(event_file)
+                        elif isinstance(data, (np.ndarray, bytes)):
+                            self._submit_file(target, data, message)
+                            continue
+                        else:
+                            self._save_json(target, data)
+                        if message:
+                            self.logger.info(f"{message}: {data}")
+                    except Exception as e:
+                        self.logger.error(f"Failed to write {target}: {str(e)}")
+                for event_file in touched:
+                    event_file.flush()
+            with self._idle:
+                self._writing = False
+                self._idle.notify_all()
+    
+    def _submit_file(self, target: Path, data, message: str = None):
+        """Передает запись скриншота в пул потоков (вызывается из потока записи)"""
+        self._io_slots.acquire()
+        future = self._io_pool.submit(self._write_file, target, data, message)
+        self._io_futures.add(future)
+        future.add_done_callback(self._file_done)
+    
+    def _file_done(self, future):
+        self._io_futures.discard(future)
+        self._io_slots.release()
+    
+    def _write_file(self, target: Path, data, message: str = None):
+        """Кодирует кадр в JPEG (если нужно) и записывает файл (поток пула)"""
+        try:
+            if isinstance(data, np.ndarray):
+                _, buffer = cv2.imencode(
+                    '.jpg', data, [cv2.IMWRITE_JPEG_QUALITY, SCREENSHOT_JPEG_QUALITY]
+                )
+                data = buffer.tobytes()
+            with open(target, "wb") as f:
+                f.write(data)
+            if message:
+                self.logger.info(f"{message}: {target}")
+        except Exception as e:
+            self.logger.error(f"Failed to write {target}: {str(e)}")
+    
+    def flush(self, timeout: float = None) -> bool:
+        """Ожидает записи всех поставленных в очередь данных"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._pending.set()
+        with self._idle:
+            if not self._idle.wait_for(lambda: not self._queue and not self._writing, timeout):
+                return False
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        _, not_done = wait(list(self._io_futures), remaining)
+        return not not_done
+    
+    def close(self):
+        """Дописывает очередь и закрывает файлы событий перед завершением работы"""
+        self.flush(timeout=5.0)
+        self._io_pool.shutdown(wait=True)
+        for event_file in self._event_files.values():
+            event_file.close()
+        
+        # Останавливаем поток логирования; последующие сообщения пишутся напрямую
+        if self._log_listener is not None:
+            self._log_listener.stop()
+            root = logging.getLogger()
+            root.removeHandler(self._queue_handler)
+            for handler in self._log_listener.handlers:
+                root.addHandler(handler)
+            self._log_listener = None
     
     def _save_json(self, file_path: Path, data: Dict[str, Any]):
-        """Сохраняет данные в JSON файл"""
+        """Сохраняет данные в JSON файл (через orjson, если он установлен)
+        
+        Оба пути пишут одинаковый формат с отступом в два пробела, как orjson.
+        """
+        if orjson is not None:
+            file_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+            return
         with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=4, ensure_ascii=False)
+            json.dump(data, f, indent=2, ensure_ascii=False)
+    
+    def _dumps_line(self, data: Dict[str, Any]) -> bytes:
+        """Кодирует событие в одну строку JSON Lines"""
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+        return (json.dumps(data, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
     
     def get_session_summary(self) -> Dict[str, Any]:
         """Возвращает сводку по текущей сессии"""
+        self.flush()
         summary = {
             "date": self.date_dir.name,
             "session_start": self.session_dir.name,
-            "total_shots": len(list(self.directories["shots"].glob("*.json"))),
-            "total_hits": len(list(self.directories["hits"].glob("*.json"))),
-            "total_misses": len(list(self.directories["misses"].glob("*.json"))),
-            "total_detections": len(list(self.directories["target_detections"].glob("*.json"))),
-            "total_predictions": len(list(self.directories["predictions"].glob("*.json"))),
-            "total_difficulties": len(list(self.directories["difficulties"].glob("*.json"))),
-            "total_screenshots": len(list(self.directories["screenshots"].glob("*.png")))
+            "total_shots": self._counts["shots"],
+            "total_hits": self._counts["hits"],
+            "total_misses": self._counts["misses"],
+            "total_detections": self._counts["target_detections"],
+            "total_predictions": self._counts["predictions"],
+            "total_difficulties": self._counts["difficulties"],
+            "total_screenshots": self._counts["screenshots"]
         }
         
         # Сохраняем сводку
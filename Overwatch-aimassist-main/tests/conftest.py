@@ -31,6 +31,7 @@ def setup_test_environment():
     Config.BASE_SMOOTHING = original_config['BASE_SMOOTHING']
     Config.PREDICTION_ENABLED = original_config['PREDICTION_ENABLED']
     Config.MAX_PREDICTION_DISTANCE = original_config['MAX_PREDICTION_DISTANCE']
+    Config.update_derived()
 
 @pytest.fixture
 def mock_win32api():
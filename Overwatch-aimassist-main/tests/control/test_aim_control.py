@@ -9,7 +9,9 @@ from src.control.aim_control import (
     calculate_target_velocity,
     predict_target_position,
     adaptive_smoothing,
-    move_crosshair
+    move_crosshair,
+    move_mouse,
+    compute_move
 )
 from src.core.config import Config
 from src.core.aim_state import AimState
@@ -36,11 +38,15 @@ def test_calculate_target_velocity():
     vx, vy = calculate_target_velocity(current_pos, last_pos, dt)
     assert vx == 50.0
     assert vy == 50.0
+    
+    # Intervals below timer resolution report no motion
+    assert calculate_target_velocity(current_pos, last_pos, 1e-9) == (0.0, 0.0)
 
 @pytest.mark.parametrize("current_pos,velocity,prediction_time,expected", [
     ((100, 100), (50, 30), 0.5, (125, 115)),
     ((0, 0), (70, 70), 1.0, (70, 70)),
     ((200, 200), (-50, -30), 0.5, (175, 185)),
+    ((120, 80), (0.0, 0.0), 0.5, (120, 80)),
 ])
 def test_predict_target_position(current_pos, velocity, prediction_time, expected):
     """Test target position prediction"""
@@ -67,6 +73,43 @@ def test_move_crosshair(aim_state):
         move_crosshair(x_offset, y_offset, target_size, aim_state)
         mock_mouse_event.assert_called_once()
 
+def test_compute_move():
+    """Test fused kernel against the individual aim steps"""
+    center = (Config.DETECTION_SIZE // 2, Config.DETECTION_SIZE // 2)
+    velocity = calculate_target_velocity((150, 140), (140, 130), 0.05)
+    predicted = predict_target_position((150, 140), velocity, Config.PREDICTION_TIME)
+    x_offset = predicted[0] - center[0]
+    y_offset = predicted[1] - center[1] + Config.VERTICAL_OFFSET
+    
+    result = compute_move(
+        150, 140, 140, 130, 0.05, 0, 0, 1000, center[0], center[1],
+        Config.VERTICAL_OFFSET, Config.PREDICTION_TIME, Config.MAX_PREDICTION_DISTANCE,
+        Config.BASE_SMOOTHING, Config.SIZE_SMOOTHING_FACTOR,
+        Config.DISTANCE_SMOOTHING_FACTOR, Config.VELOCITY_SMOOTHING_FACTOR,
+        Config.INV_MAX_TARGET_AREA, Config.INV_DETECTION_SIZE
+    )
+    pred_x, pred_y, vx, vy, fused_x_offset, fused_y_offset, move_x, move_y = result
+    
+    assert (pred_x, pred_y) == predicted
+    assert (vx, vy) == pytest.approx(velocity)
+    assert (fused_x_offset, fused_y_offset) == (x_offset, y_offset)
+    
+    smoothing = adaptive_smoothing(1000, (x_offset**2 + y_offset**2)**0.5,
+                                   (velocity[0]**2 + velocity[1]**2)**0.5)
+    assert move_x == pytest.approx(x_offset * smoothing)
+    assert move_y == pytest.approx(y_offset * smoothing)
+
+def test_move_mouse_carries_residual(aim_state):
+    """Test sub-pixel movement accumulates instead of being truncated"""
+    with patch('win32api.mouse_event') as mock_mouse_event:
+        move_mouse(0.6, 0.0, aim_state)
+        mock_mouse_event.assert_not_called()
+        
+        move_mouse(0.6, 0.0, aim_state)
+        mock_mouse_event.assert_called_once()
+        assert mock_mouse_event.call_args[0][1:3] == (1, 0)
+        assert aim_state.residual_x == pytest.approx(0.2)
+
 @pytest.mark.integration
 def test_aim_control_integration():
     """Test integration of aim control components"""
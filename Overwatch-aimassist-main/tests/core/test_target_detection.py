@@ -4,13 +4,19 @@ Tests for target detection module
 
 import pytest
 import numpy as np
+import cv2
 from src.core.target_detection import (
     calculate_distance,
     create_target_mask,
     extract_targets,
     calculate_target_score,
-    select_best_target
+    select_best_target,
+    roi_size,
+    TargetDetector,
+    _best_target_index,
+    _best_target_index_numpy
 )
+from src.types import TargetBatch
 from src.core.config import Config
 from tests.test_utils import create_test_frame
 
@@ -73,6 +79,14 @@ def test_select_best_target(center):
     best = select_best_target(targets, center, current_target)
     assert best in targets
 
+def test_roi_size():
+    """Test tracking window size limits and rounding"""
+    assert roi_size(0) == Config.ROI_MIN_SIZE
+    assert roi_size(10**6) == Config.DETECTION_SIZE
+    size = roi_size(1000)
+    assert size >= 4 * int(np.sqrt(1000))
+    assert size % Config.ROI_SIZE_STEP == 0
+
 @pytest.mark.slow
 def test_target_tracking(center):
     """Test target tracking over multiple frames"""
@@ -101,4 +115,74 @@ def test_target_detection_boundaries(target_pos, expected_detected):
     frame = create_test_frame([target_pos])
     mask = create_target_mask(frame)
     targets = extract_targets(mask)
-    assert (len(targets) > 0) == expected_detected 
\ No newline at end of file
+    assert (len(targets) > 0) == expected_detected
+
+def test_filter_targets():
+    """Test distance and overlap filtering of detector targets"""
+    detector = TargetDetector({'target_detection': {
+        'confidence_threshold': 0.5,
+        'min_target_size': 10,
+        'max_target_distance': 300,
+        'detection_frequency': 1
+    }})
+    targets = [
+        {'position': (100, 100), 'size': 50, 'confidence': 1.0, 'velocity': None, 'class_id': 0},
+        {'position': (120, 100), 'size': 50, 'confidence': 1.0, 'velocity': None, 'class_id': 0},
+        {'position': (150, 100), 'size': 50, 'confidence': 1.0, 'velocity': (1.0, 2.0), 'class_id': 0},
+        {'position': (400, 400), 'size': 50, 'confidence': 1.0, 'velocity': None, 'class_id': 0},
+    ]
+    assert detector._filter_targets(targets) == [targets[0], targets[2]]
+    assert detector._filter_targets([]) == []
+    assert TargetBatch.from_targets(targets).as_dicts() == targets
+
+def test_best_target_index_numpy(center):
+    """Test NumPy rating fallback picks the same target as select_best_target"""
+    targets = [(50, 50, 500), (center[0] + 5, center[1], 800), (200, 200, 1500)]
+    best = _best_target_index_numpy(np.asarray(targets, dtype=np.float64),
+                                    center[0], center[1], 0, 0, 0, False,
+                                    Config.SCORE_WEIGHTS, Config.INV_MAX_TARGET_AREA)
+    assert targets[best] == select_best_target(targets, center, None)
+
+def test_target_mask_matches_in_range():
+    """Test mask equals the union of both red HSV ranges"""
+    frame = np.random.default_rng(0).integers(0, 256, (64, 64, 3), dtype=np.uint8)
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    expected = cv2.bitwise_or(cv2.inRange(hsv, Config.LOWER_RED1, Config.UPPER_RED1),
+                              cv2.inRange(hsv, Config.LOWER_RED2, Config.UPPER_RED2))
+    assert np.array_equal(create_target_mask(frame), expected)
+    
+    # A dst view of the wrong size is left alone instead of being overrun
+    buf = np.zeros((64, 64), dtype=np.uint8)
+    mask = create_target_mask(frame, dst=buf[:32, :32])
+    assert np.array_equal(mask, expected)
+    assert not buf.any()
+
+def test_best_target_index_matches_score(center):
+    """Test compiled rating picks the target with the highest calculate_target_score"""
+    targets = [(40, 60, 300), (center[0] + 20, center[1] - 10, 900), (180, 90, 1800), (120, 140, 600)]
+    current = (125, 135, 600)
+    scores = [calculate_target_score(t, center, current) for t in targets]
+    best = _best_target_index(np.asarray(targets, dtype=np.float64),
+                              center[0], center[1], current[0], current[1], current[2], True,
+                              Config.SCORE_WEIGHTS, Config.INV_MAX_TARGET_AREA)
+    assert best == scores.index(max(scores))
+
+def test_best_target_index_keeps_current(center):
+    """Test both rating paths return the row equal to the current target"""
+    targets = np.asarray([(center[0], center[1], 1800), (30, 40, 300), (200, 60, 500)], dtype=np.float64)
+    args = (center[0], center[1], 200, 60, 500, True, Config.SCORE_WEIGHTS, Config.INV_MAX_TARGET_AREA)
+    assert _best_target_index(targets, *args) == 2
+    assert _best_target_index_numpy(targets, *args) == 2
+
+def test_extract_targets_downscaled():
+    """Test targets found on a half-size mask are reported at full-size coordinates"""
+    targets = [(60, 70, 1600), (180, 160, 900)]
+    frame = create_test_frame(targets)
+    small = cv2.resize(frame, (Config.DETECTION_SIZE // 2, Config.DETECTION_SIZE // 2),
+                       interpolation=cv2.INTER_AREA)
+    extracted = extract_targets(create_target_mask(small), 2)
+    
+    assert len(extracted) == len(targets)
+    for (x, y, size), (cx, cy, area) in zip(targets, extracted):
+        assert abs(x - cx) <= 2 and abs(y - cy) <= 2
+        assert abs(area - size) <= 0.25 * size
@@ -48,6 +48,15 @@ class TestGameVisualizer(unittest.TestCase):
         self.assertEqual(frame.shape, (600, 800, 3))
         self.assertEqual(frame.dtype, np.uint8)
     
+    def test_draw_world_cache(self):
+        """Test cached world frame is copied and rebuilt on resize"""
+        frame = self.visualizer.draw_world()
+        frame[:] = 0
+        self.assertTrue(np.any(self.visualizer.draw_world()))
+
+        self.visualizer.window_size = (400, 300)
+        self.assertEqual(self.visualizer.draw_world().shape, (300, 400, 3))
+
     def test_draw_primitive(self):
         """Test primitive shape drawing"""
         # Test cube
@@ -68,6 +77,16 @@ class TestGameVisualizer(unittest.TestCase):
         )
         self.assertEqual(cylinder_frame.shape, (600, 800, 3))
     
+    def test_primitive_projection_cache(self):
+        """Test repeated primitives reuse their projection until a resize"""
+        first = self.visualizer.draw_primitive("cube", (0, 0, 0), (20, 20, 20)).copy()
+        second = self.visualizer.draw_primitive("cube", (0, 0, 0), (20, 20, 20))
+        np.testing.assert_array_equal(first, second)
+        self.assertEqual(self.visualizer._project_cube.cache_info().hits, 1)
+        
+        self.visualizer.window_size = (400, 300)
+        self.assertEqual(self.visualizer._project_cube.cache_info().currsize, 0)
+    
     def test_vision_effects(self):
         """Test vision effect application"""
         # Create test frame
@@ -117,6 +136,13 @@ class TestGameVisualizer(unittest.TestCase):
         points_2d = self.visualizer._project_points(points_3d)
         self.assertEqual(len(points_2d), 2)
         self.assertEqual(len(points_2d[0]), 2)
+    
+    def test_project_point_precision(self):
+        """Test single-point projection keeps float64 precision"""
+        scale = self.visualizer.projection_scale
+        for x, y, z in [(10.1, -20.3, 30), (-399.9, 299.7, 0), (0, 0, 0)]:
+            self.assertEqual(self.visualizer._project_point((x, y, z)),
+                             (x * scale + 400, y * -scale + 300))
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -65,7 +65,7 @@ def test_full_aiming_cycle(mock_mouse_event, aim_state, test_profile_settings):
         if current_target:
             # Update aim state
             if aim_state.current_target:
-                dt = time.time() - aim_state.last_update_time
+                dt = (time.perf_counter_ns() - aim_state.last_update_time_ns) * 1e-9
                 aim_state.target_velocity = calculate_target_velocity(
                     (current_target[0], current_target[1]),
                     aim_state.last_target_pos,
@@ -74,7 +74,7 @@ def test_full_aiming_cycle(mock_mouse_event, aim_state, test_profile_settings):
             
             aim_state.current_target = current_target
             aim_state.last_target_pos = (current_target[0], current_target[1])
-            aim_state.last_update_time = time.time()
+            aim_state.last_update_time_ns = time.perf_counter_ns()
             
             # Predict target position
             predicted = predict_target_position(
@@ -108,7 +108,7 @@ def test_error_handling(aim_state):
     
     # Test with invalid target positions
     invalid_targets = [(-100, -100, 50), (1000, 1000, 50)]
-    frame = create_test_frame(invalid_targets)
+    frame = create_test_frame(invalid_targets, out=frame)
     mask = create_target_mask(frame)
     targets = extract_targets(mask)
     
@@ -127,17 +127,17 @@ def test_performance(aim_state):
         (400, 400, 60)
     ]
     
-    start_time = time.time()
+    frame = np.zeros((Config.DETECTION_SIZE, Config.DETECTION_SIZE, 3), dtype=np.uint8)
+    start_ns = time.perf_counter_ns()
     
-    # Process multiple frames
+    # Process multiple frames, reusing one frame buffer
     for _ in range(100):
-        frame = create_test_frame(targets)
+        create_test_frame(targets, out=frame)
         mask = create_target_mask(frame)
         targets = extract_targets(mask)
         current_target = select_best_target(targets, aim_state.screen_center, None)
     
-    end_time = time.time()
-    processing_time = end_time - start_time
+    processing_time = (time.perf_counter_ns() - start_ns) * 1e-9
     
     # Should process frames quickly enough
     assert processing_time < 1.0  # Less than 1 second for 100 frames
@@ -3,21 +3,26 @@ Test utilities for Overwatch Aim Assist
 """
 
 import numpy as np
-import cv2
-from typing import Tuple, List
+from typing import Tuple, List, Optional
 from src.core.config import Config
 
-def create_test_frame(target_positions: List[Tuple[int, int, float]]) -> np.ndarray:
+def create_test_frame(target_positions: List[Tuple[int, int, float]],
+                      out: Optional[np.ndarray] = None) -> np.ndarray:
     """
     Create a test frame with target markers
     
     Args:
         target_positions: List of (x, y, size) tuples for target positions
+        out: Optional (DETECTION_SIZE, DETECTION_SIZE, 3) uint8 frame to clear and reuse
         
     Returns:
         Test frame with target markers
     """
-    frame = np.zeros((Config.DETECTION_SIZE, Config.DETECTION_SIZE, 3), dtype=np.uint8)
+    if out is None:
+        frame = np.zeros((Config.DETECTION_SIZE, Config.DETECTION_SIZE, 3), dtype=np.uint8)
+    else:
+        frame = out
+        frame.fill(0)
     
     # Sort targets by size in descending order to draw larger targets first
     target_positions = sorted(target_positions, key=lambda x: x[2], reverse=True)
@@ -31,10 +36,16 @@ def create_test_frame(target_positions: List[Tuple[int, int, float]]) -> np.ndar
         x2 = min(Config.DETECTION_SIZE - 1, x + half_side)
         y2 = min(Config.DETECTION_SIZE - 1, y + half_side)
         
-        # Draw target only if it doesn't overlap with existing targets
+        # Order and clip the corners as cv2.rectangle would, so off-frame
+        # targets stay clipped to the border
+        x1, x2 = np.clip(sorted((x1, x2)), 0, Config.DETECTION_SIZE - 1)
+        y1, y2 = np.clip(sorted((y1, y2)), 0, Config.DETECTION_SIZE - 1)
+        
+        # Draw target only if it doesn't overlap with existing targets;
+        # targets are pure red, so checking the red channel is enough
         target_area = frame[y1:y2+1, x1:x2+1]
-        if not np.any(target_area > 0):
-            cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 0, 255), -1)  # Fill rectangle
+        if not target_area[:, :, 2].any():
+            target_area[:] = (0, 0, 255)  # Fill rectangle
         
     return frame
 
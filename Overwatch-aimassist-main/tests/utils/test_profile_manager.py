@@ -107,4 +107,17 @@ def test_profile_file_corruption(test_profiles_dir):
         f.write("invalid json content")
     
     success = load_profile(profile_name)
-    assert not success 
\ No newline at end of file
+    assert not success
+
+
+def test_profile_cache_invalidation(test_profiles_dir, test_profile_settings):
+    """Test cached listings and profiles are refreshed when files change"""
+    create_test_profile("profile1", test_profile_settings)
+    assert load_profile("profile1")
+    assert list_profiles() == ["profile1"]
+    
+    create_test_profile("profile1", {**test_profile_settings, "BASE_SMOOTHING": 0.75})
+    create_test_profile("profile2", test_profile_settings)
+    assert load_profile("profile1")
+    assert Config.BASE_SMOOTHING == 0.75
+    assert sorted(list_profiles()) == ["profile1", "profile2"]